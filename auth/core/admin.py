@@ -0,0 +1,10 @@
+import secrets
+from fastapi import HTTPException
+from core.config import AdminSettings
+
+
+def check_admin(token: str):
+    """Reject a request unless it carries the ADMIN_TOKEN as X-Admin-Token."""
+    expected = AdminSettings.TOKEN
+    if not expected or not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Access denied")
@@ -12,3 +12,43 @@ class AuthSettings:
 
 class BaseSettings:
     LINK = getenv("LINK")
+    POOL_SIZE = int(getenv("DB_POOL_SIZE", 5))
+    MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", 5))
+    POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", 30))  # seconds
+    POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", 1800))  # seconds, -1 disables
+    POOL_PRE_PING = getenv("DB_POOL_PRE_PING", "1") == "1"
+    # asyncpg prepared statement cache per connection; 0 behind pgbouncer
+    STATEMENT_CACHE_SIZE = int(getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
+
+class HashingSettings:
+    POOL_KIND = getenv("HASH_POOL_KIND", "thread")  # "thread" or "process"
+    POOL_SIZE = int(getenv("HASH_POOL_SIZE", 4))
+
+
+class ServiceSettings:
+    # Shared secret other services send as X-Service-Key; unset allows any
+    # caller, as for the other user endpoints.
+    KEY = getenv("SERVICE_KEY")
+    MAX_LOOKUP_IDS = int(getenv("MAX_LOOKUP_IDS", 1000))
+
+
+class ProfilerSettings:
+    ENABLED = getenv("PROFILER", "0") == "1"
+    SAMPLE_RATE = float(getenv("PROFILER_SAMPLE_RATE", 1.0))  # share of requests
+    THRESHOLD_MS = float(getenv("PROFILER_THRESHOLD_MS", 500))
+    DIR = getenv("PROFILER_DIR", "profiles")
+    MAX_FILES = int(getenv("PROFILER_MAX_FILES", 50))
+
+
+class AdminSettings:
+    # Required as X-Admin-Token by /admin/profiles and /auth/users/export;
+    # unset disables those endpoints.
+    TOKEN = getenv("ADMIN_TOKEN")
+
+
+class QueryStatsSettings:
+    # Per-request query count, DB time and slowest statement as X-DB-* headers.
+    HEADERS = getenv("QUERY_STATS_HEADERS", "0") == "1"
+    # Same statement run more often than this in one request logs a warning.
+    N_PLUS_ONE_THRESHOLD = int(getenv("N_PLUS_ONE_THRESHOLD", 10))
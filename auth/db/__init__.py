@@ -1,18 +1,75 @@
-from sqlalchemy.orm import DeclarativeBase
+from pathlib import Path
+import asyncio
+from sqlalchemy import inspect, make_url, text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from core.config import BaseSettings
+from db.models import Base
+from db.pool import InstrumentedPool
 
-engine = create_async_engine(BaseSettings.LINK)
+
+def _engine_options():
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": BaseSettings.POOL_SIZE,
+        "max_overflow": BaseSettings.MAX_OVERFLOW,
+        "pool_timeout": BaseSettings.POOL_TIMEOUT,
+        "pool_recycle": BaseSettings.POOL_RECYCLE,
+        "pool_pre_ping": BaseSettings.POOL_PRE_PING,
+    }
+    if make_url(BaseSettings.LINK).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": BaseSettings.STATEMENT_CACHE_SIZE
+        }
+    return options
+
+
+engine = create_async_engine(BaseSettings.LINK, **_engine_options())
 SessionLocal = async_sessionmaker(bind=engine)
 
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+
+def _check_schema(connection):
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    script = ScriptDirectory.from_config(config)
+    expected = set(script.get_heads())
+    context = MigrationContext.configure(connection)
+    current = set(context.get_current_heads())
 
-class Base(DeclarativeBase):
-    pass
+    if current == expected:
+        return
+    if current:
+        raise RuntimeError(
+            f"Database is at revision {sorted(current)}, expected {sorted(expected)}."
+            " Run `alembic upgrade head` before starting the service."
+        )
+
+    # No Alembic history: bootstrap from the models. An empty database is
+    # stamped at head so later migrations apply on top of it.
+    was_empty = not inspect(connection).get_table_names()
+    Base.metadata.create_all(connection)
+    if was_empty:
+        context.stamp(script, "heads")
+
+
+async def _ping():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
 
 
 async def init_db():
+    """Verify or bootstrap the schema once and open the pool's connections.
+
+    Any failure propagates so the service refuses to start.
+    """
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_check_schema)
+
+    await asyncio.gather(*(_ping() for _ in range(engine.pool.size())))
 
 
 async def get_db():
@@ -1,18 +1,22 @@
-from sqlalchemy import Column, BigInteger, String
+from sqlalchemy import Column, BigInteger, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns; the variant lets
+# the benchmarks run the service on aiosqlite.
+BigIntegerPK = BigInteger().with_variant(Integer(), "sqlite")
+
 
 class Teacher(Base):
     __tablename__ = "teachers"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
 
 
 class Student(Base):
     __tablename__ = "students"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
@@ -0,0 +1,62 @@
+import base64
+import binascii
+import json
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import Student, Teacher
+
+# Listing order is (role, id); roles sort alphabetically.
+ROLES = {"student": Student, "teacher": Teacher}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(role: str, user_id: int) -> str:
+    raw = json.dumps([role, user_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        role, user_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if role not in ROLES or not isinstance(user_id, int):
+        raise InvalidCursor(cursor)
+    return role, user_id
+
+
+async def page_users(
+    db: AsyncSession, limit: int, after: tuple = None, role: str = None
+) -> list:
+    """Return up to ``limit`` users ordered by (role, id), starting after a key.
+
+    Each table contributes at most ``limit`` rows read in primary key order,
+    so a page costs the same at any depth, unlike OFFSET.
+    """
+    branches = []
+    for name in sorted(ROLES):
+        if role is not None and name != role:
+            continue
+        if after is not None and name < after[0]:
+            continue
+        model = ROLES[name]
+        query = select(literal(name).label("role"), model.id, model.email)
+        if after is not None and name == after[0]:
+            query = query.where(model.id > after[1])
+        branches.append(query.order_by(model.id).limit(limit))
+
+    if not branches:
+        return []
+    if len(branches) == 1:
+        result = await db.execute(branches[0])
+        return result.all()
+
+    users = union_all(*(branch.subquery().select() for branch in branches)).subquery()
+    result = await db.execute(
+        select(users).order_by(users.c.role, users.c.id).limit(limit)
+    )
+    return result.all()
@@ -1,8 +1,11 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status, Request
+import asyncio
+import time
 import jwt
-from core.config import AuthSettings
+from core.config import AuthSettings, HashingSettings
 
 
 SECRET_KEY = AuthSettings.SECRET_KEY
@@ -20,6 +23,63 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool instead of the event loop.
+
+    At most ``size`` hashes run at once; further callers wait on a FIFO
+    semaphore, so a login storm queues in arrival order while every other
+    route keeps being served.
+    """
+
+    def __init__(self, kind: str, size: int):
+        executor = ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor
+        self.executor = executor(max_workers=size)
+        self.slots = asyncio.Semaphore(size)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+
+    async def run(self, fn, *args):
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.wait_seconds += time.perf_counter() - queued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "wait_seconds_total": round(self.wait_seconds, 6),
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(HashingSettings.POOL_KIND, HashingSettings.POOL_SIZE)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, ip: str):
     to_encode = data.copy()
     to_encode.update(
@@ -1,8 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routers.routes import router
+from db import engine, init_db
+from jwt_auth import password_hasher
+from metrics import MetricsMiddleware, instrument, metrics_endpoint
+from profiler import ProfilerMiddleware, router as profiler_router
+from core.config import ProfilerSettings
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    yield
+    password_hasher.shutdown()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,4 +26,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if ProfilerSettings.ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+instrument(engine, password_hasher)
+
 app.include_router(router)
+app.include_router(profiler_router)
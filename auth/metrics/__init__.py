@@ -0,0 +1,230 @@
+"""Prometheus metrics for the auth service, served at /metrics.
+
+Requests are labelled by route template, never by raw path, so label sets
+stay bounded. Pool numbers are read when the endpoint is scraped, so they
+cost nothing per request.
+"""
+
+from contextvars import ContextVar
+import logging
+import re
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from starlette.responses import Response
+from core.config import QueryStatsSettings
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests.", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to send the full response.",
+    ["method", "route"],
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled.")
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Time spent executing one SQL statement."
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling one request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time of one request.",
+    ["method", "route"],
+)
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_total",
+    "Requests that repeated one statement past the N+1 threshold.",
+    ["method", "route"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection."
+)
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request."""
+
+    __slots__ = ("count", "seconds", "slowest", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = ""
+        self.statements = {}
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        # Parameters are bound separately, so the text is the statement shape.
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def headers(self) -> list:
+        slowest = re.sub(r"\s+", " ", self.slowest_statement)[:200]
+        return [
+            (b"x-db-query-count", str(self.count).encode()),
+            (b"x-db-time-ms", f"{self.seconds * 1000:.2f}".encode()),
+            (b"x-db-slowest-ms", f"{self.slowest * 1000:.2f}".encode()),
+            (b"x-db-slowest-statement", slowest.encode("latin-1", "replace")),
+        ]
+
+
+current_queries = ContextVar("current_queries", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware counting requests per route template.
+
+    It also collects the request's SQL statements: they are exported as
+    metrics, sent back as X-DB-* headers when QUERY_STATS_HEADERS is set, and
+    a statement repeated past the N+1 threshold is logged.
+    """
+
+    def __init__(
+        self,
+        app,
+        headers: bool = QueryStatsSettings.HEADERS,
+        n_plus_one_threshold: int = QueryStatsSettings.N_PLUS_ONE_THRESHOLD,
+    ):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        queries = QueryStats()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.headers:
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", ()), *queries.headers()],
+                    }
+            await send(message)
+
+        IN_FLIGHT.inc()
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_queries.reset(token)
+            IN_FLIGHT.dec()
+            # The router stores the matched route in the shared scope.
+            route = scope.get("route")
+            template = route.path if route is not None else UNMATCHED
+            method = scope["method"]
+            REQUESTS.labels(method, template, status).inc()
+            REQUEST_LATENCY.labels(method, template).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(method, template).observe(queries.count)
+            DB_TIME_PER_REQUEST.labels(method, template).observe(queries.seconds)
+            self._check_n_plus_one(method, template, queries)
+
+    def _check_n_plus_one(self, method: str, template: str, queries: QueryStats):
+        repeated = False
+        for statement, times in queries.statements.items():
+            if times > self.n_plus_one_threshold:
+                repeated = True
+                logger.warning(
+                    "probable N+1 in %s %s: statement ran %d times: %s",
+                    method,
+                    template,
+                    times,
+                    statement,
+                )
+        if repeated:
+            DB_N_PLUS_ONE.labels(method, template).inc()
+
+
+class StateCollector:
+    """Reports connection and hashing pool counters at scrape time."""
+
+    def __init__(self, engine, password_hasher):
+        self.engine = engine
+        self.password_hasher = password_hasher
+
+    def collect(self):
+        pool = self.engine.pool.snapshot()
+        yield GaugeMetricFamily("db_pool_size", "Configured pool size.", pool["size"])
+        yield GaugeMetricFamily(
+            "db_pool_checked_out", "Connections in use.", pool["checked_out"]
+        )
+        yield GaugeMetricFamily(
+            "db_pool_overflow", "Connections beyond the pool size.", pool["overflow"]
+        )
+        yield CounterMetricFamily(
+            "db_pool_checkouts", "Pool checkouts.", pool["checkouts"]
+        )
+        yield CounterMetricFamily(
+            "db_pool_timeouts", "Checkouts that timed out.", pool["timeouts"]
+        )
+
+        hashing = self.password_hasher.stats()
+        yield GaugeMetricFamily(
+            "password_hash_waiting", "Hashes waiting for a worker.", hashing["waiting"]
+        )
+        yield GaugeMetricFamily(
+            "password_hash_running", "Hashes being computed.", hashing["running"]
+        )
+        yield CounterMetricFamily(
+            "password_hash_completed", "Hashes computed.", hashing["completed"]
+        )
+        yield CounterMetricFamily(
+            "password_hash_wait_seconds",
+            "Time hashes spent waiting for a worker.",
+            hashing["wait_seconds_total"],
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - context.metrics_started
+    DB_QUERY_LATENCY.observe(elapsed)
+    # SQLAlchemy runs this in a greenlet sharing the request's context.
+    queries = current_queries.get()
+    if queries is not None:
+        queries.record(statement, elapsed)
+
+
+def instrument(engine, password_hasher):
+    """Hook the engine and hashing pool up to the collectors; call once."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    engine.pool.stats.listeners.append(DB_POOL_WAIT.observe)
+    REGISTRY.register(StateCollector(engine, password_hasher))
+
+
+async def metrics_endpoint(request):
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
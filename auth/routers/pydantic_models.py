@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Literal, Optional
 
 
 class UserReg(BaseModel):
@@ -16,3 +17,18 @@ class UserLog(BaseModel):
 class UserResponse(BaseModel):
     id: int
     email: str
+    role: str
+
+
+class UserList(BaseModel):
+    users: List[UserResponse]
+
+
+class UserPage(BaseModel):
+    users: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
+class UserLookup(BaseModel):
+    ids: List[int]
+    role: Literal["student", "teacher"] = "student"
@@ -1,16 +1,35 @@
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict
-from jwt_auth import hash_password, verify_password, create_access_token
+from typing import Literal, Optional
+from jwt_auth import hash_password_async, verify_password_async, create_access_token
 from db.models import Student, Teacher
-from db import get_db
-from routers.pydantic_models import UserReg, UserLog, UserResponse
+from db import SessionLocal, get_db
+from db.users import (
+    ROLES,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    page_users,
+)
+from routers.pydantic_models import (
+    UserReg,
+    UserLog,
+    UserList,
+    UserLookup,
+    UserPage,
+)
+from core.config import ServiceSettings
+from core.admin import check_admin
 from fastapi import APIRouter
+import json
 
 
 router = APIRouter(prefix="/auth")
 
+EXPORT_PAGE_SIZE = 1000
+
 
 @router.get("/ping")
 async def read_root():
@@ -20,7 +39,7 @@ async def read_root():
 @router.post("/register")
 async def register(user: UserReg, db: AsyncSession = Depends(get_db)):
     role = user.role
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     if role == "student":
         db_user = Student(email=user.email, password=hashed_password)
     elif role == "teacher":
@@ -39,7 +58,9 @@ async def login(user: UserLog, request: Request, db: AsyncSession = Depends(get_
     elif role == "teacher":
         result = await db.execute(select(Teacher).where(Teacher.email == user.email))
     db_user = result.scalars().first()
-    if db_user is None or not verify_password(user.password, db_user.password):
+    if db_user is None or not await verify_password_async(
+        user.password, db_user.password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
@@ -51,14 +72,82 @@ async def login(user: UserLog, request: Request, db: AsyncSession = Depends(get_
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.get("/users", response_model=Dict[str, List[UserResponse]])
+@router.get("/users", response_model=UserPage)
 async def get_users(
-    limit: int = 10, offset: int = 0, db: AsyncSession = Depends(get_db)
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    role: Optional[Literal["student", "teacher"]] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+    # One extra row tells whether another page exists.
+    rows = await page_users(db, limit + 1, after, role)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].role, rows[-1].id)
+    return {"users": [row._asdict() for row in rows], "next_cursor": next_cursor}
+
+
+@router.get("/users/export")
+async def export_users(
+    role: Optional[Literal["student", "teacher"]] = None,
+    x_admin_token: str = Header(None),
 ):
-    teachers_result = await db.execute(select(Teacher).offset(offset).limit(limit))
-    students_result = await db.execute(select(Student).offset(offset).limit(limit))
+    """Stream every user as NDJSON, one keyset page in memory at a time.
+
+    Requires the ADMIN_TOKEN as X-Admin-Token.
+    """
+    check_admin(x_admin_token)
+
+    async def lines():
+        after = None
+        # The request's dependencies are closed before a streamed body is
+        # sent, so the export opens its own session.
+        async with SessionLocal() as db:
+            while True:
+                rows = await page_users(db, EXPORT_PAGE_SIZE, after, role)
+                for row in rows:
+                    yield json.dumps(row._asdict()) + "\n"
+                if len(rows) < EXPORT_PAGE_SIZE:
+                    break
+                after = (rows[-1].role, rows[-1].id)
+                # End the read transaction between pages.
+                await db.rollback()
 
-    teachers = teachers_result.scalars().all()
-    students = students_result.scalars().all()
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
-    return {"teachers": teachers, "students": students}
+
+@router.post("/users/lookup", response_model=UserList)
+async def lookup_users(
+    lookup: UserLookup,
+    x_service_key: str = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Resolve many user IDs of one role in a single query.
+
+    Unknown IDs are left out of the response.
+    """
+    if ServiceSettings.KEY and x_service_key != ServiceSettings.KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if len(lookup.ids) > ServiceSettings.MAX_LOOKUP_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {ServiceSettings.MAX_LOOKUP_IDS} ids per lookup",
+        )
+    model = ROLES[lookup.role]
+    result = await db.execute(
+        select(model.id, model.email).where(model.id.in_(set(lookup.ids)))
+    )
+    users = [
+        {"id": user_id, "email": email, "role": lookup.role}
+        for user_id, email in result
+    ]
+    return {"users": users}
@@ -0,0 +1,53 @@
+"""add class memberships
+
+Revision ID: ecea252919e7
+Revises: 07205782bfbb
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ecea252919e7'
+down_revision: Union[str, None] = '07205782bfbb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('class_memberships',
+    sa.Column('class_id', sa.BigInteger(), nullable=False),
+    sa.Column('student_id', sa.BigInteger(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('class_id', 'student_id')
+    )
+    op.create_index('ix_class_memberships_student_id_class_id', 'class_memberships', ['student_id', 'class_id'], unique=False)
+    # Переносим учеников из массива classes.student_ids
+    op.execute(text("""
+        INSERT INTO class_memberships (class_id, student_id)
+        SELECT DISTINCT c.id, s.student_id
+        FROM classes c
+        CROSS JOIN LATERAL unnest(c.student_ids) AS s(student_id)
+        WHERE s.student_id IS NOT NULL
+    """))
+
+
+def downgrade() -> None:
+    # Возвращаем учеников обратно в массив
+    op.execute(text("""
+        UPDATE classes
+        SET student_ids = COALESCE(
+            (SELECT array_agg(m.student_id ORDER BY m.joined_at)
+             FROM class_memberships m
+             WHERE m.class_id = classes.id),
+            '{}'
+        )
+    """))
+    op.drop_index('ix_class_memberships_student_id_class_id', table_name='class_memberships')
+    op.drop_table('class_memberships')
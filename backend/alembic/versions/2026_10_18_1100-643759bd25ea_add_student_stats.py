@@ -0,0 +1,38 @@
+"""add student stats
+
+Revision ID: 643759bd25ea
+Revises: ecea252919e7
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '643759bd25ea'
+down_revision: Union[str, None] = 'ecea252919e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('student_stats',
+    sa.Column('student_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('total_sessions', sa.BigInteger(), nullable=False),
+    sa.Column('correct_sum', sa.BigInteger(), nullable=False),
+    sa.Column('count_sum', sa.BigInteger(), nullable=False),
+    sa.Column('last_activity', sa.Date(), nullable=True),
+    sa.Column('current_streak', sa.BigInteger(), nullable=False),
+    sa.Column('last_streak_day', sa.Date(), nullable=True),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+    op.create_index('ix_practices_student_id_time_id', 'practices', ['student_id', 'time', 'id'], unique=False)
+    # Заполняется отдельно: python -m scripts.backfill_student_stats
+
+
+def downgrade() -> None:
+    op.drop_index('ix_practices_student_id_time_id', table_name='practices')
+    op.drop_table('student_stats')
@@ -0,0 +1,33 @@
+"""add hot path indexes
+
+Revision ID: 5d2f8a41c7b3
+Revises: 643759bd25ea
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a41c7b3'
+down_revision: Union[str, None] = '643759bd25ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_classes_teacher_id', 'classes', ['teacher_id'], unique=False)
+    op.create_index('ix_tests_class_id_hand_in_by_date', 'tests', ['class_id', 'hand_in_by_date'], unique=False)
+    op.create_index('ix_results_student_id_test_id', 'results', ['student_id', 'test_id'], unique=False)
+    op.create_index('ix_results_test_id_student_id_id', 'results', ['test_id', 'student_id', 'id'], unique=False)
+    # Проверка планов: python -m scripts.check_query_plans
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_test_id_student_id_id', table_name='results')
+    op.drop_index('ix_results_student_id_test_id', table_name='results')
+    op.drop_index('ix_tests_class_id_hand_in_by_date', table_name='tests')
+    op.drop_index('ix_classes_teacher_id', table_name='classes')
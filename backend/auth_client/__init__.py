@@ -0,0 +1,102 @@
+from collections import OrderedDict
+import time
+import httpx
+from core.config import AuthServiceSettings
+
+
+class AuthClient:
+    """Client for the auth service's bulk user lookup.
+
+    Requests share one keep-alive connection pool. Profiles are kept in a
+    bounded LRU for ``ttl`` seconds, including IDs the auth service does not
+    know, so a roster costs one call per ``batch_size`` IDs not seen recently.
+    """
+
+    def __init__(
+        self,
+        base_url: str = AuthServiceSettings.URL,
+        service_key: str = AuthServiceSettings.SERVICE_KEY,
+        max_connections: int = AuthServiceSettings.POOL_SIZE,
+        timeout: float = AuthServiceSettings.TIMEOUT,
+        ttl: int = AuthServiceSettings.PROFILE_TTL,
+        maxsize: int = AuthServiceSettings.PROFILE_CACHE_SIZE,
+        batch_size: int = AuthServiceSettings.LOOKUP_BATCH_SIZE,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        headers = {"X-Service-Key": service_key} if service_key else {}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.profiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lookups = 0
+
+    def _cached(self, key):
+        entry = self.profiles.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return False, None
+        self.profiles.move_to_end(key)
+        return True, entry[1]
+
+    def _store(self, key, profile):
+        self.profiles[key] = (time.monotonic() + self.ttl, profile)
+        self.profiles.move_to_end(key)
+        if len(self.profiles) > self.maxsize:
+            self.profiles.popitem(last=False)
+
+    async def get_profiles(self, ids, role: str = "student") -> dict:
+        """Map each known ID to its profile; unknown IDs are left out.
+
+        Raises httpx.HTTPError when the auth service cannot be reached.
+        """
+        ids = list(dict.fromkeys(ids))
+        profiles = {}
+        missing = []
+        for user_id in ids:
+            found, profile = self._cached((role, user_id))
+            if not found:
+                missing.append(user_id)
+            elif profile is not None:
+                profiles[user_id] = profile
+        self.hits += len(ids) - len(missing)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            self.lookups += 1
+            response = await self.client.post(
+                "/auth/users/lookup", json={"ids": batch, "role": role}
+            )
+            response.raise_for_status()
+            found = {user["id"]: user for user in response.json()["users"]}
+            for user_id in batch:
+                profile = found.get(user_id)
+                self._store((role, user_id), profile)
+                if profile is not None:
+                    profiles[user_id] = profile
+        return profiles
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookups": self.lookups,
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+
+auth_client = AuthClient()
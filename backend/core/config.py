@@ -8,7 +8,74 @@ class AuthSettings:
     SECRET_KEY = getenv("SECRET_KEY")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE = 2  # hours
+    TOKEN_CACHE_SIZE = int(getenv("TOKEN_CACHE_SIZE", 0))  # 0 disables the cache
 
 
 class BaseSettings:
     LINK = getenv("LINK")
+    POOL_SIZE = int(getenv("DB_POOL_SIZE", 10))
+    MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", 10))
+    POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", 30))  # seconds
+    POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", 1800))  # seconds, -1 disables
+    POOL_PRE_PING = getenv("DB_POOL_PRE_PING", "1") == "1"
+    # asyncpg prepared statement cache per connection; 0 behind pgbouncer
+    STATEMENT_CACHE_SIZE = int(getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
+
+class RedisSettings:
+    HOST = getenv("REDIS_HOST", "localhost")
+    PORT = int(getenv("REDIS_PORT", 6379))
+    DB = int(getenv("REDIS_DB", 0))
+    POOL_SIZE = int(getenv("REDIS_POOL_SIZE", 50))
+    POOL_TIMEOUT = float(getenv("REDIS_POOL_TIMEOUT", 5))  # seconds
+
+
+class QuizSettings:
+    MAX_BATCH_SIZE = int(getenv("QUESTION_BATCH_MAX", 50))
+
+
+class WriteBehindSettings:
+    ENABLED = getenv("WRITE_BEHIND", "0") == "1"
+    QUEUE_SIZE = int(getenv("WRITE_BEHIND_QUEUE_SIZE", 10000))
+    FLUSH_SIZE = int(getenv("WRITE_BEHIND_FLUSH_SIZE", 500))
+    FLUSH_INTERVAL = float(getenv("WRITE_BEHIND_FLUSH_INTERVAL", 0.2))  # seconds
+    SPOOL_PATH = getenv("WRITE_BEHIND_SPOOL", "write_behind_spool.jsonl")
+
+
+class CacheSettings:
+    GRADEBOOK_TTL = int(getenv("GRADEBOOK_CACHE_TTL", 3600))  # seconds
+    RESPONSE_TTL = int(getenv("RESPONSE_CACHE_TTL", 3600))  # seconds
+
+
+class AuthServiceSettings:
+    URL = getenv("AUTH_SERVICE_URL", "http://localhost:8000")
+    SERVICE_KEY = getenv("SERVICE_KEY")
+    POOL_SIZE = int(getenv("AUTH_SERVICE_POOL_SIZE", 20))
+    TIMEOUT = float(getenv("AUTH_SERVICE_TIMEOUT", 5))  # seconds
+    PROFILE_TTL = int(getenv("PROFILE_CACHE_TTL", 300))  # seconds
+    PROFILE_CACHE_SIZE = int(getenv("PROFILE_CACHE_SIZE", 10000))
+    # At most the auth service's MAX_LOOKUP_IDS, which rejects larger lookups.
+    LOOKUP_BATCH_SIZE = int(getenv("AUTH_LOOKUP_BATCH_SIZE", 1000))
+
+
+class ProfilerSettings:
+    ENABLED = getenv("PROFILER", "0") == "1"
+    SAMPLE_RATE = float(getenv("PROFILER_SAMPLE_RATE", 1.0))  # share of requests
+    THRESHOLD_MS = float(getenv("PROFILER_THRESHOLD_MS", 500))
+    DIR = getenv("PROFILER_DIR", "profiles")
+    MAX_FILES = int(getenv("PROFILER_MAX_FILES", 50))
+    # Required as X-Admin-Token by /admin/profiles; unset disables the endpoints.
+    ADMIN_TOKEN = getenv("ADMIN_TOKEN")
+
+
+class QueryStatsSettings:
+    # Per-request query count, DB time and slowest statement as X-DB-* headers.
+    HEADERS = getenv("QUERY_STATS_HEADERS", "0") == "1"
+    # Same statement run more often than this in one request logs a warning.
+    N_PLUS_ONE_THRESHOLD = int(getenv("N_PLUS_ONE_THRESHOLD", 10))
+
+
+class SessionSocketSettings:
+    # Answers between Redis checkpoints of a socket's session; 1 saves each one.
+    CHECKPOINT_EVERY = int(getenv("WS_CHECKPOINT_EVERY", 5))
+    IDLE_TIMEOUT = float(getenv("WS_IDLE_TIMEOUT", 300))  # seconds
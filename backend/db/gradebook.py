@@ -0,0 +1,113 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import ClassMembership, Result, Test
+from session_store import class_scope, session_store
+
+
+def gradebook_query(class_id: int):
+    """Per assignment and student: best and latest score and attempt count.
+
+    Assignments without results yield one row with NULL student columns.
+    """
+    score = Result.outcome["correct_answers"].as_integer()
+    attempts = (
+        select(
+            Result.test_id,
+            Result.student_id,
+            score.label("score"),
+            Result.last_attempt_time,
+            func.first_value(score)
+            .over(
+                partition_by=(Result.test_id, Result.student_id),
+                order_by=(
+                    Result.last_attempt_time.desc().nulls_last(),
+                    Result.id.desc(),
+                ),
+            )
+            .label("latest_score"),
+        )
+        .join(Test, Test.id == Result.test_id)
+        .where(Test.class_id == class_id)
+        .subquery()
+    )
+    per_student = (
+        select(
+            attempts.c.test_id,
+            attempts.c.student_id,
+            func.max(attempts.c.score).label("best_score"),
+            func.max(attempts.c.latest_score).label("latest_score"),
+            func.count().label("attempts"),
+            func.max(attempts.c.last_attempt_time).label("last_attempt_time"),
+        )
+        .group_by(attempts.c.test_id, attempts.c.student_id)
+        .subquery()
+    )
+    return (
+        select(
+            Test.id,
+            Test.test_name,
+            Test.number_of_questions,
+            per_student.c.student_id,
+            per_student.c.best_score,
+            per_student.c.latest_score,
+            per_student.c.attempts,
+            per_student.c.last_attempt_time,
+        )
+        .outerjoin(per_student, per_student.c.test_id == Test.id)
+        .where(Test.class_id == class_id)
+        .order_by(Test.id, per_student.c.student_id)
+    )
+
+
+def enrolled_count_query(class_id: int):
+    return select(func.count()).where(ClassMembership.class_id == class_id)
+
+
+async def class_gradebook(db: AsyncSession, class_id: int) -> dict:
+    """Summarise every assignment of a class with one grouped query."""
+    # Counted on its own: a class without assignments has no gradebook rows.
+    enrolled_count = await db.scalar(enrolled_count_query(class_id))
+    rows = await db.execute(gradebook_query(class_id))
+    tests = {}
+    for row in rows:
+        test = tests.setdefault(
+            row.id,
+            {
+                "assignment_id": row.id,
+                "test_name": row.test_name,
+                "number_of_questions": row.number_of_questions,
+                "students": [],
+            },
+        )
+        if row.student_id is not None:
+            test["students"].append(
+                {
+                    "student_id": row.student_id,
+                    "best_score": row.best_score,
+                    "latest_score": row.latest_score,
+                    "attempts": row.attempts,
+                    "last_attempt_time": row.last_attempt_time,
+                }
+            )
+
+    for test in tests.values():
+        completed = len(test["students"])
+        test["completed"] = completed
+        # Students who left the class keep their results, hence the cap.
+        test["completion_rate"] = (
+            min(1.0, round(completed / enrolled_count, 4)) if enrolled_count else 0.0
+        )
+    return {
+        "class_id": class_id,
+        "enrolled": enrolled_count,
+        "assignments": list(tests.values()),
+    }
+
+
+async def invalidate_results(db: AsyncSession, test_ids):
+    """Drop cached views of the classes that own the given assignments."""
+    class_ids = (
+        await db.scalars(select(Test.class_id).where(Test.id.in_(test_ids)).distinct())
+    ).all()
+    if class_ids:
+        await session_store.bump_versions(*map(class_scope, class_ids))
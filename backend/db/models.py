@@ -7,6 +7,10 @@ from sqlalchemy import (
     Boolean,
     JSON,
     Time,
+    DateTime,
+    Index,
+    Integer,
+    func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
@@ -15,19 +19,43 @@ from uuid import uuid4
 
 Base = declarative_base()
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns and has no ARRAY;
+# the variants let the benchmarks run the app on aiosqlite.
+BigIntegerPK = BigInteger().with_variant(Integer(), "sqlite")
+BigIntegerArray = ARRAY(BigInteger).with_variant(JSON(), "sqlite")
+
 
 class Class(Base):
     __tablename__ = "classes"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     teacher_id = Column(BigInteger, nullable=False)
-    student_ids = Column(ARRAY(BigInteger), default=[])
+    # Superseded by class_memberships and no longer read or written; kept
+    # until a follow-up migration drops it.
+    student_ids = Column(BigIntegerArray, default=[])
     cl_name = Column(String, nullable=False)
     join_code = Column(String, unique=True, default=lambda: str(uuid4())[:8])
 
+    __table_args__ = (Index("ix_classes_teacher_id", "teacher_id"),)
+
+
+class ClassMembership(Base):
+    __tablename__ = "class_memberships"
+    class_id = Column(
+        BigInteger, ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True
+    )
+    student_id = Column(BigInteger, primary_key=True)
+    joined_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_class_memberships_student_id_class_id", "student_id", "class_id"),
+    )
+
 
 class Test(Base):
     __tablename__ = "tests"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     class_id = Column(BigInteger, ForeignKey("classes.id"), nullable=False)
     test_name = Column(String, nullable=False)
     hand_in_by_date = Column(Date, nullable=False)
@@ -37,20 +65,46 @@ class Test(Base):
     time_to_answer = Column(BigInteger, nullable=False)
     completed_by = Column(BigInteger, default=0)
 
+    __table_args__ = (
+        Index("ix_tests_class_id_hand_in_by_date", "class_id", "hand_in_by_date"),
+    )
+
 
 class Result(Base):
     __tablename__ = "results"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     student_id = Column(BigInteger, nullable=False)
     test_id = Column(BigInteger, ForeignKey("tests.id"), nullable=False)
     last_attempt_time = Column(Date, nullable=True)
     outcome = Column(JSON, nullable=True)
 
+    __table_args__ = (
+        Index("ix_results_student_id_test_id", "student_id", "test_id"),
+        Index("ix_results_test_id_student_id_id", "test_id", "student_id", "id"),
+    )
+
 
 class Practice(Base):
     __tablename__ = "practices"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
     student_id = Column(BigInteger, nullable=False)
     time = Column(Date, nullable=True)
     correct = Column(BigInteger, nullable=False)
     count = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_practices_student_id_time_id", "student_id", "time", "id"),
+    )
+
+
+class StudentStats(Base):
+    """Running practice totals per student, updated by end_practice."""
+
+    __tablename__ = "student_stats"
+    student_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    total_sessions = Column(BigInteger, nullable=False, default=0)
+    correct_sum = Column(BigInteger, nullable=False, default=0)
+    count_sum = Column(BigInteger, nullable=False, default=0)
+    last_activity = Column(Date, nullable=True)
+    current_streak = Column(BigInteger, nullable=False, default=0)
+    last_streak_day = Column(Date, nullable=True)
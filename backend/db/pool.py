@@ -0,0 +1,54 @@
+import time
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """Checkout counters of an InstrumentedPool.
+
+    Callables appended to ``listeners`` receive the wait of every checkout
+    in seconds, which is how metrics exporters hook in.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.listeners = []
+
+    def record(self, waited: float, timed_out: bool):
+        self.checkouts += 1
+        self.timeouts += timed_out
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        for listener in self.listeners:
+            listener(waited)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that measures how long checkouts wait."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = True
+        try:
+            connection = super()._do_get()
+            timed_out = False
+            return connection
+        finally:
+            self.stats.record(time.perf_counter() - started, timed_out)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": self.stats.checkouts,
+            "timeouts": self.stats.timeouts,
+            "wait_seconds_total": round(self.stats.wait_seconds, 6),
+            "max_wait_seconds": round(self.stats.max_wait_seconds, 6),
+        }
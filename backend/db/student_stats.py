@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import StudentStats
+
+
+async def record_practice(
+    db: AsyncSession, student_id: int, day: date, correct: int, count: int
+):
+    """Fold one finished practice into the student's running totals.
+
+    Must run in the same transaction that inserts the Practice row.
+    """
+    stats = await db.get(StudentStats, student_id, with_for_update=True)
+    if stats is None:
+        try:
+            async with db.begin_nested():
+                stats = StudentStats(
+                    student_id=student_id,
+                    total_sessions=0,
+                    correct_sum=0,
+                    count_sum=0,
+                    current_streak=0,
+                )
+                db.add(stats)
+        except IntegrityError:
+            # A concurrent first practice created the row first.
+            stats = await db.get(
+                StudentStats, student_id, with_for_update=True, populate_existing=True
+            )
+
+    stats.total_sessions += 1
+    stats.correct_sum += correct
+    stats.count_sum += count
+    if stats.last_activity is None or day > stats.last_activity:
+        stats.last_activity = day
+
+    if stats.last_streak_day == day:
+        pass
+    elif stats.last_streak_day == day - timedelta(days=1):
+        stats.current_streak += 1
+        stats.last_streak_day = day
+    elif stats.last_streak_day is None or day > stats.last_streak_day:
+        stats.current_streak = 1
+        stats.last_streak_day = day
+
+
+def current_streak(stats: StudentStats, today: date) -> int:
+    """The streak only counts while it reaches today."""
+    if stats.last_streak_day == today:
+        return stats.current_streak
+    return 0
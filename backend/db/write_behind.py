@@ -0,0 +1,188 @@
+from datetime import date
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import time
+from sqlalchemy import Date, insert
+from core.config import WriteBehindSettings
+from db import SessionLocal
+from db.models import Practice, Result
+from db.student_stats import record_practice
+from db.gradebook import invalidate_results
+
+logger = logging.getLogger(__name__)
+
+MODELS = {model.__tablename__: model for model in (Practice, Result)}
+
+
+class WriteBehind:
+    """Batches Result and Practice inserts off the request path.
+
+    Routes enqueue plain row dicts; a background task collects up to
+    ``flush_size`` rows or waits ``flush_interval`` seconds, then writes
+    them with one multi-row INSERT per table in a single transaction.
+    Practice rows update student_stats in that same transaction.
+
+    Rows from a failed flush are appended to a JSONL spool file and
+    replayed on the next start, so shutting down with the database
+    unreachable loses nothing.
+
+    Callables appended to ``listeners`` receive the duration in seconds of
+    every successful flush.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = WriteBehindSettings.ENABLED,
+        queue_size: int = WriteBehindSettings.QUEUE_SIZE,
+        flush_size: int = WriteBehindSettings.FLUSH_SIZE,
+        flush_interval: float = WriteBehindSettings.FLUSH_INTERVAL,
+        spool_path: str = WriteBehindSettings.SPOOL_PATH,
+    ):
+        self.enabled = enabled
+        self.queue_size = queue_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool_path = Path(spool_path)
+        self.queue = None
+        self.task = None
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.rows_spooled = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.listeners = []
+
+    async def put(self, model, row: dict):
+        """Queue a row; waits when the queue is full."""
+        await self.queue.put((model.__tablename__, row))
+
+    async def start(self):
+        if not self.enabled:
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        await self._replay_spool()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything queued so far, then stop the background task."""
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            items = []
+            deadline = None
+            while len(items) < self.flush_size:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                items.append(item)
+            if items:
+                await self._flush(items)
+
+    async def _flush(self, items):
+        started = time.perf_counter()
+        try:
+            await self._write(items)
+        except Exception:
+            logger.exception("write-behind flush of %d rows failed", len(items))
+            self._spool(items)
+            return
+        elapsed = time.perf_counter() - started
+        self.flushes += 1
+        self.rows_flushed += len(items)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        for listener in self.listeners:
+            listener(elapsed)
+
+    @staticmethod
+    async def _write(items):
+        rows = {table: [] for table in MODELS}
+        for table, row in items:
+            rows[table].append(row)
+        async with SessionLocal() as db:
+            for table, table_rows in rows.items():
+                if table_rows:
+                    await db.execute(insert(MODELS[table]), table_rows)
+            for row in rows[Practice.__tablename__]:
+                await record_practice(
+                    db, row["student_id"], row["time"], row["correct"], row["count"]
+                )
+            await db.commit()
+            test_ids = {row["test_id"] for row in rows[Result.__tablename__]}
+            if test_ids:
+                # The rows are committed; a failed invalidation must not
+                # send them to the spool and have them inserted twice.
+                try:
+                    await invalidate_results(db, test_ids)
+                except Exception:
+                    logger.exception("gradebook invalidation failed")
+
+    def _spool(self, items):
+        with self.spool_path.open("a", encoding="utf-8") as spool:
+            for table, row in items:
+                spool.write(json.dumps({"table": table, "row": row}, default=str))
+                spool.write("\n")
+        self.rows_spooled += len(items)
+
+    async def _replay_spool(self):
+        # Workers of one deployment share the spool path and start together;
+        # renaming the file first lets exactly one of them replay it.
+        claimed = self.spool_path.with_name(f"{self.spool_path.name}.{os.getpid()}")
+        try:
+            self.spool_path.rename(claimed)
+        except FileNotFoundError:
+            return
+        lines = claimed.read_text(encoding="utf-8").splitlines()
+        items = []
+        for line in lines:
+            record = json.loads(line)
+            model = MODELS[record["table"]]
+            row = record["row"]
+            for column in model.__table__.c:
+                value = row.get(column.key)
+                if isinstance(column.type, Date) and isinstance(value, str):
+                    row[column.key] = date.fromisoformat(value[:10])
+            items.append((record["table"], row))
+        try:
+            if items:
+                await self._write(items)
+                self.rows_flushed += len(items)
+        except Exception:
+            # Hand the rows back to the spool for the next attempt.
+            with self.spool_path.open("a", encoding="utf-8") as spool:
+                spool.writelines(line + "\n" for line in lines)
+            raise
+        finally:
+            claimed.unlink()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "rows_spooled": self.rows_spooled,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+            "max_flush_seconds": round(self.max_flush_seconds, 6),
+        }
+
+
+write_behind = WriteBehind()
@@ -1,6 +1,9 @@
 from passlib.context import CryptContext
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from hashlib import sha256
 from fastapi import HTTPException, status, Request
+import time
 import jwt
 from core.config import AuthSettings
 
@@ -12,9 +15,62 @@ ACCESS_TOKEN_EXPIRE = AuthSettings.ACCESS_TOKEN_EXPIRE
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class TokenCache:
+    """Bounded LRU of already verified token payloads.
+
+    Entries are keyed by a SHA-256 digest of the token and dropped once the
+    token's exp has passed. Only the signature check and decoding are
+    skipped; the caller still checks the IP binding on every request.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str):
+        key = sha256(token.encode()).digest()
+        payload = self.entries.get(key)
+        if payload is not None:
+            exp = payload.get("exp")
+            if exp is None or exp > time.time():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, payload: dict):
+        self.entries[sha256(token.encode()).digest()] = payload
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = (
+    TokenCache(AuthSettings.TOKEN_CACHE_SIZE)
+    if AuthSettings.TOKEN_CACHE_SIZE > 0
+    else None
+)
+
+
+def decode_token(token: str) -> dict:
+    if token_cache is None or not token:
+        return jwt.decode(token, str(SECRET_KEY), algorithms=[ALGORITHM])
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, str(SECRET_KEY), algorithms=[ALGORITHM])
+        token_cache.put(token, payload)
+    return payload
+
+
 async def verify_token(request: Request, token: str):
     try:
-        payload = jwt.decode(token, str(SECRET_KEY), algorithms=[ALGORITHM])
+        payload = decode_token(token)
 
         token_ip = payload.get("ip")
         if token_ip != request.client.host:
@@ -1,10 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from routers.routes import router
+from routers.ws import router as ws_router
+from db import engine, init_db
+from db.write_behind import write_behind
+from session_store import session_store
+from auth_client import auth_client
+from metrics import MetricsMiddleware, instrument, metrics_endpoint
+from profiler import ProfilerMiddleware, router as profiler_router
+from core.config import ProfilerSettings
 
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await write_behind.start()
+    yield
+    await write_behind.stop()
+    await session_store.close()
+    await auth_client.close()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -13,4 +34,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if ProfilerSettings.ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+instrument(engine, session_store, write_behind)
+
 app.include_router(router)
+app.include_router(ws_router)
+app.include_router(profiler_router)
@@ -0,0 +1,127 @@
+"""Opt-in cProfile sampling of slow requests.
+
+Profiles are kept only for requests slower than the threshold. They are
+written as pstats dumps, readable with ``python -m pstats`` or snakeviz, into
+a directory that keeps the newest ``max_files`` dumps.
+
+cProfile follows the event loop thread, so a dump also contains whatever
+other requests ran while the profiled one was awaiting. To keep dumps
+readable, only one request is profiled at a time.
+"""
+
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import cProfile
+import random
+import re
+import secrets
+import time
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from core.config import ProfilerSettings
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of pstats dumps."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def dumps(self) -> list:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.prof"), reverse=True)
+
+    def save(self, profiler: cProfile.Profile, method: str, route: str, ms: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        profiler.dump_stats(self.directory / f"{stamp}-{method}-{slug}-{ms:.0f}ms.prof")
+        for stale in self.dumps()[self.max_files :]:
+            stale.unlink(missing_ok=True)
+
+    def path(self, name: str):
+        for path in self.dumps():
+            if path.name == name:
+                return path
+        return None
+
+
+profile_store = ProfileStore(ProfilerSettings.DIR, ProfilerSettings.MAX_FILES)
+
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware profiling a sample of requests."""
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore = profile_store,
+        sample_rate: float = ProfilerSettings.SAMPLE_RATE,
+        threshold_ms: float = ProfilerSettings.THRESHOLD_MS,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.busy = False
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or self.busy
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.busy = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self.busy = False
+            ms = (time.perf_counter() - started) * 1000
+            if ms >= self.threshold_ms:
+                route = scope.get("route")
+                await asyncio.to_thread(
+                    self.store.save,
+                    profiler,
+                    scope["method"],
+                    route.path if route is not None else scope["path"],
+                    ms,
+                )
+
+
+def check_admin(token: str):
+    expected = ProfilerSettings.ADMIN_TOKEN
+    if not expected or not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Access denied")
+
+
+router = APIRouter(prefix="/admin/profiles", include_in_schema=False)
+
+
+@router.get("")
+async def list_profiles(x_admin_token: str = Header(None)):
+    check_admin(x_admin_token)
+    return {
+        "profiles": [
+            {"name": path.name, "size": path.stat().st_size}
+            for path in profile_store.dumps()
+        ]
+    }
+
+
+@router.get("/{name}")
+async def download_profile(name: str, x_admin_token: str = Header(None)):
+    check_admin(x_admin_token)
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
@@ -0,0 +1,63 @@
+"""Response bodies built straight from query rows.
+
+The rows come from our own database, so they are not validated again: the
+models in pydantic_models.py only document the responses, and routes return
+these dicts in an ORJSONResponse, which skips FastAPI's validation and
+jsonable_encoder pass.
+"""
+
+from datetime import date, datetime, time
+from typing import Optional
+from db.models import Test
+
+HOMEWORK_COLUMNS = tuple(Test.__table__.columns)
+
+ASSIGNMENT_COLUMNS = (
+    Test.test_name,
+    Test.hand_in_by_date,
+    Test.created_date,
+    Test.multiple_attempts,
+    Test.number_of_questions,
+    Test.time_to_answer,
+    Test.completed_by,
+)
+
+
+def midnight(day: Optional[date]) -> Optional[datetime]:
+    """Date columns the API has always sent as datetimes."""
+    return datetime.combine(day, time()) if day is not None else None
+
+
+def homework(row) -> dict:
+    return row._asdict()
+
+
+def assignment(row) -> dict:
+    return {
+        "test_name": row.test_name,
+        "hand_in_by_date": midnight(row.hand_in_by_date),
+        "created_date": midnight(row.created_date),
+        "multiple_attempts": row.multiple_attempts,
+        "number_of_questions": row.number_of_questions,
+        "time_to_answer": row.time_to_answer,
+        "completed_by": row.completed_by,
+    }
+
+
+def class_summary(row) -> dict:
+    return {
+        "id": row.id,
+        "teacher_id": row.teacher_id,
+        "cl_name": row.cl_name,
+        "students": [],
+        "assignments": [],
+    }
+
+
+def session_history_item(row) -> dict:
+    return {
+        "date": midnight(row.time),
+        "correct": row.correct,
+        "count": row.count,
+        "accuracy": row.correct / row.count * 100 if row.count > 0 else 0.0,
+    }
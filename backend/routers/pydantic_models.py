@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Literal, Optional
+from datetime import date, datetime
 
 
 class ClassTittle(BaseModel):
@@ -17,6 +17,7 @@ class ClassOut(BaseModel):
 
 class Answer(BaseModel):
     answer: str | int
+    question_id: Optional[int] = None
 
 
 class Assignment(BaseModel):
@@ -29,6 +30,13 @@ class Assignment(BaseModel):
     time_to_answer: int
 
 
+class SessionStart(BaseModel):
+    token: str
+    mode: Literal["practice", "assignment"]
+    assignment_id: Optional[int] = None
+    resume: bool = False
+
+
 class Assignments(BaseModel):
     class_id: int
 
@@ -59,3 +67,35 @@ class StatisticsResponse(BaseModel):
     recent_activity: Optional[datetime]
     session_history: List[SessionHistoryItem]
     learning_streak: int
+
+
+class GradebookStudent(BaseModel):
+    student_id: int
+    best_score: Optional[int]
+    latest_score: Optional[int]
+    attempts: int
+    last_attempt_time: Optional[date]
+
+
+class GradebookAssignment(BaseModel):
+    assignment_id: int
+    test_name: str
+    number_of_questions: int
+    completed: int
+    completion_rate: float
+    students: List[GradebookStudent]
+
+
+class GradebookResponse(BaseModel):
+    class_id: int
+    enrolled: int
+    assignments: List[GradebookAssignment]
+
+
+class ClassStudent(BaseModel):
+    id: int
+    email: Optional[str]
+
+
+class ClassStudents(BaseModel):
+    students: List[ClassStudent]
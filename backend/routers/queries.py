@@ -0,0 +1,85 @@
+"""Statements the hot routes run, built in one place.
+
+scripts/check_query_plans.py EXPLAINs these same builders, so the plan check
+covers the SQL the routes actually send.
+"""
+
+from datetime import datetime
+from sqlalchemy import BigInteger, insert, literal
+from sqlalchemy.future import select
+from db.models import Class, ClassMembership, Practice, Test
+from routers import dto
+
+
+def recent_practices_query(student_id: int, limit: int = 3):
+    return (
+        select(Practice.time, Practice.correct, Practice.count)
+        .where(Practice.student_id == student_id)
+        .order_by(Practice.time.desc(), Practice.id.desc())
+        .limit(limit)
+    )
+
+
+def teacher_classes_query(teacher_id: int):
+    return (
+        select(Class.id, Class.teacher_id, Class.cl_name, ClassMembership.student_id)
+        .outerjoin(ClassMembership, ClassMembership.class_id == Class.id)
+        .where(Class.teacher_id == teacher_id)
+        .order_by(Class.id, ClassMembership.joined_at)
+    )
+
+
+def join_code_query(code: str, student_id: int):
+    """The membership row to insert for a join code, if the code exists."""
+    return select(Class.id, literal(student_id, BigInteger)).where(
+        Class.join_code == code
+    )
+
+
+def join_class_statement(code: str, student_id: int):
+    """Enrol a student by join code in one INSERT ... SELECT.
+
+    Returns the class id and its teacher id, or no row for an unknown code.
+    """
+    # join_code is unique, so this is the teacher of the class joined.
+    teacher_id = select(Class.teacher_id).where(Class.join_code == code)
+    return (
+        insert(ClassMembership)
+        .from_select(["class_id", "student_id"], join_code_query(code, student_id))
+        .returning(
+            ClassMembership.class_id,
+            teacher_id.scalar_subquery().label("teacher_id"),
+        )
+    )
+
+
+def class_owner_query(class_id: int):
+    return select(Class.teacher_id).where(Class.id == class_id)
+
+
+def class_assignments_query(class_id: int):
+    return select(*dto.ASSIGNMENT_COLUMNS).where(Test.class_id == class_id)
+
+
+def open_homeworks_query(student_id: int, now: datetime):
+    return (
+        select(*dto.HOMEWORK_COLUMNS)
+        .join(ClassMembership, ClassMembership.class_id == Test.class_id)
+        .where(ClassMembership.student_id == student_id, Test.hand_in_by_date > now)
+    )
+
+
+def any_membership_query(student_id: int):
+    return (
+        select(ClassMembership.class_id)
+        .where(ClassMembership.student_id == student_id)
+        .limit(1)
+    )
+
+
+def roster_query(class_id: int):
+    return (
+        select(ClassMembership.student_id)
+        .where(ClassMembership.class_id == class_id)
+        .order_by(ClassMembership.joined_at, ClassMembership.student_id)
+    )
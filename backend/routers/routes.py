@@ -1,58 +1,48 @@
-from fastapi import APIRouter, HTTPException, Request, Header, Depends, status
-from sqlalchemy import update
+from fastapi import APIRouter, HTTPException, Request, Header, Depends, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.future import select
-from db.models import Class, Test, Result, Practice
-from db import get_db
+from db.models import Class, ClassMembership, Test, Result, Practice, StudentStats
+from db.student_stats import record_practice, current_streak
+from db.gradebook import class_gradebook, invalidate_results
+from db.write_behind import write_behind
+from db import SessionLocal, get_db
 from jwt_auth import verify_token
-from trig_quiz import generate_question
+from auth_client import auth_client
+from session_store import class_scope, session_store, teacher_scope
+from trig_quiz import (
+    count_correct,
+    generate_question,
+    new_seed,
+    question_at,
+    questions_at,
+)
+from core.config import CacheSettings, QuizSettings
+from routers import dto, queries
 from routers.pydantic_models import (
     ClassTittle,
     ClassOut,
     Answer,
     Assignment,
     AssignmentOut,
-    SessionHistoryItem,
     StatisticsResponse,
+    GradebookResponse,
+    ClassStudents,
 )
-from typing import List, Dict
-import redis
-from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
+from datetime import datetime, timezone
+import csv
+import io
+import httpx
 import json
+import time
 
-
-class RedisClient:
-    def __init__(self, host="localhost", port=6379, db=0):
-        self.client = redis.Redis(host=host, port=port, db=db)
-
-    def set_data(self, key: str, data: dict, expiration: int = None):
-        """Set data in Redis with optional expiration time."""
-        value = json.dumps(data)
-        if expiration:
-            self.client.setex(key, expiration, value)
-        else:
-            self.client.set(key, value)
-
-    def get_data(self, key: str):
-        """Get data from Redis."""
-        value = self.client.get(key)
-        if value:
-            return json.loads(value.decode("utf-8"))
-        return None
-
-    def delete_data(self, key: str):
-        """Delete data from Redis."""
-        self.client.delete(key)
-
-    def key_exists(self, key: str) -> bool:
-        """Check if a key exists in Redis."""
-        return self.client.exists(key) > 0
-
-
-redis_client = RedisClient()
 router = APIRouter(prefix="/api")
 
+EXPORT_CHUNK_SIZE = 500
+
 
 @router.get("/ping")
 async def read_root():
@@ -80,47 +70,31 @@ async def get_statistics(
         raise HTTPException(
             status_code=403, detail="Only students can view statistics."
         )
-    practices = await db.execute(
-        select(Practice)
-        .where(Practice.student_id == user_id)
-        .order_by(Practice.time.desc())
-    )
-    practices = practices.scalars().all()
-    total_sessions = len(practices)
-    correct_answers = sum(p.correct for p in practices)
-    total_questions = sum(p.count for p in practices)
+    stats = await db.get(StudentStats, user_id)
+    recent = await db.execute(queries.recent_practices_query(user_id))
+    session_history = [dto.session_history_item(row) for row in recent]
+
+    total_sessions = stats.total_sessions if stats else 0
+    correct_answers = stats.correct_sum if stats else 0
+    total_questions = stats.count_sum if stats else 0
     practice_accuracy = (
         (correct_answers / total_questions * 100) if total_questions > 0 else 0
     )
-    session_history = [
-        SessionHistoryItem(
-            date=p.time,
-            correct=p.correct,
-            count=p.count,
-            accuracy=(p.correct / p.count * 100) if p.count > 0 else 0,
-        )
-        for p in practices[:3]
-    ]
-    recent_activity = practices[0].time if practices else None
+    recent_activity = stats.last_activity if stats else None
     today = datetime.now(timezone.utc).date()
-    active_days = sorted({p.time for p in practices}, reverse=True)
-    streak = 0
-    for active_day in active_days:
-        if active_day == today:
-            streak += 1
-            today -= timedelta(days=1)
-        else:
-            break
-
-    return StatisticsResponse(
-        email=user_data["email"],
-        role=user_data["role"],
-        practice_accuracy=round(practice_accuracy, 2),
-        total_sessions=total_sessions,
-        correct_answers=correct_answers,
-        recent_activity=recent_activity,
-        session_history=session_history,
-        learning_streak=streak,
+    streak = current_streak(stats, today) if stats else 0
+
+    return ORJSONResponse(
+        {
+            "email": user_data["email"],
+            "role": user_data["role"],
+            "practice_accuracy": round(float(practice_accuracy), 2),
+            "total_sessions": total_sessions,
+            "correct_answers": correct_answers,
+            "recent_activity": dto.midnight(recent_activity),
+            "session_history": session_history,
+            "learning_streak": streak,
+        }
     )
 
 
@@ -137,6 +111,7 @@ async def post_class(
         db.add(new_class)
         await db.commit()
         await db.refresh(new_class)
+        await session_store.bump_versions(teacher_scope(user_data["id"]))
         return {"teacher_id": user_data["id"], "cl_name": classname.name}
     return {"msg": f"you are not a teacher {user_data['role']}"}
 
@@ -149,26 +124,27 @@ async def get_classes(
 ):
     user_data = await verify_token(request, token)
     if user_data["role"] == "teacher":
-        classes_result = await db.execute(
-            select(Class).where(Class.teacher_id == user_data["id"])
+        scope = teacher_scope(user_data["id"])
+        version, classes = await session_store.get_cached(scope, "classes")
+        if classes is not None:
+            return ORJSONResponse({"classes": classes})
+
+        rows = await db.execute(queries.teacher_classes_query(user_data["id"]))
+
+        class_out = {}
+        for row in rows:
+            if row.id not in class_out:
+                class_out[row.id] = dto.class_summary(row)
+            if row.student_id is not None:
+                class_out[row.id]["students"].append(row.student_id)
+
+        classes = list(class_out.values())
+        await session_store.set_cached(
+            scope, "classes", version, classes, CacheSettings.RESPONSE_TTL
         )
+        return ORJSONResponse({"classes": classes})
 
-        classes = classes_result.scalars().all()
-
-        class_out = [
-            ClassOut(
-                id=cls.id,
-                teacher_id=cls.teacher_id,
-                cl_name=cls.cl_name,
-                students=cls.student_ids if cls.student_ids else [],
-                assignments=[],
-            )
-            for cls in classes
-        ]
-
-        return {"classes": class_out}
-
-    return {"msg": f"you are not a teacher {user_data['role']}"}
+    return ORJSONResponse({"msg": f"you are not a teacher {user_data['role']}"})
 
 
 @router.get("/classes/{class_id}/join-link")
@@ -182,11 +158,18 @@ async def get_join_link(
     if user_data["role"] == "student":
         raise HTTPException(status_code=403, detail="Access denied")
 
-    class_obj = await db.get(Class, class_id)
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
+    scope = class_scope(class_id)
+    version, join_link = await session_store.get_cached(scope, "join_link")
+    if join_link is None:
+        class_obj = await db.get(Class, class_id)
+        if not class_obj:
+            raise HTTPException(status_code=404, detail="Class not found")
+        join_link = class_obj.join_code
+        await session_store.set_cached(
+            scope, "join_link", version, join_link, CacheSettings.RESPONSE_TTL
+        )
 
-    return {"join_link": class_obj.join_code}
+    return {"join_link": join_link}
 
 
 @router.get("/join/class/{code}")
@@ -201,25 +184,23 @@ async def join_class_by_code(
     if user_data["role"] == "teacher":
         raise HTTPException(status_code=403, detail="Only students can join classes")
 
-    result = await db.execute(select(Class).where(Class.join_code == code))
-    class_obj = result.scalar_one_or_none()
-
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Invalid class code")
-
-    if user_data["id"] in class_obj.student_ids:
+    # One INSERT ... SELECT: no row back means the code is unknown, a primary
+    # key conflict means the student is already enrolled.
+    try:
+        joined = (
+            await db.execute(queries.join_class_statement(code, user_data["id"]))
+        ).one_or_none()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Student already joined")
 
-    updated_student_ids = class_obj.student_ids + [user_data["id"]]
+    if joined is None:
+        raise HTTPException(status_code=404, detail="Invalid class code")
 
-    await db.execute(
-        update(Class)
-        .where(Class.id == class_obj.id)
-        .values(student_ids=updated_student_ids)
+    await session_store.bump_versions(
+        class_scope(joined.class_id), teacher_scope(joined.teacher_id)
     )
-
-    await db.commit()
-    await db.refresh(class_obj)
     return {"message": "Successfully joined the class"}
 
 
@@ -242,9 +223,12 @@ async def start_assignment(
             "correct_answers": 0,
             "assignment_id": assignment_id,
             "student_id": user_data["id"],
+            "seed": new_seed(),
+            "next": 0,
+            "active_since": time.time(),
         }
 
-        redis_client.set_data(f"started_test_{user_data['id']}", test_data)
+        await session_store.set_hash(f"started_test_{user_data['id']}", test_data)
         return {"question_time_limit": test_settings.time_to_answer}
     raise HTTPException(status_code=403, detail="Access forbidden.")
 
@@ -254,27 +238,82 @@ async def get_question(request: Request, token: str = Header(None)):
     user_data = await verify_token(request, token)
     user_id = user_data["id"]
     if user_data["role"] == "student":
-        started_test = redis_client.get_data(f"started_test_{user_id}")
-        if not started_test:
+        served = await session_store.serve_questions(f"started_test_{user_id}")
+        if not served:
             raise HTTPException(
                 status_code=404, detail="Test not started or question not found"
             )
-        question_time_limit = started_test["question_time_limit"]
-        question, correct_answer, options = generate_question()
+        index = served["start"]
+        question, _, options = question_at(served["seed"], index)
+        return {"question": question, "options": options, "question_id": index}
+    raise HTTPException(status_code=403, detail="Access forbidden.")
 
-        start_time = datetime.now()
-        question_end_time = start_time + timedelta(seconds=question_time_limit)
 
-        test_data = {
-            "correct_answer": correct_answer,
-            "question_end_time": question_end_time.isoformat(),
-        }
+async def save_result(
+    db: AsyncSession, user_id: int, assignment_id: int, correct_answers: int
+):
+    row = {
+        "student_id": user_id,
+        "test_id": assignment_id,
+        "last_attempt_time": datetime.now().date(),
+        "outcome": {"correct_answers": correct_answers},
+    }
+    if write_behind.enabled:
+        await write_behind.put(Result, row)
+        return
+    db.add(Result(**row))
+    await db.commit()
+    await invalidate_results(db, [assignment_id])
 
-        redis_client.set_data(
-            f"test_data_{user_id}", test_data, expiration=question_time_limit
-        )
-        return {"question": question, "options": options}
-    raise HTTPException(status_code=403, detail="Access forbidden.")
+
+async def save_practice(db: AsyncSession, user_id: int, practice_data: dict):
+    row = {
+        "student_id": user_id,
+        "time": datetime.now().date(),
+        "correct": practice_data["correct_answers"],
+        "count": practice_data["total_questions"],
+    }
+    if write_behind.enabled:
+        await write_behind.put(Practice, row)
+        return
+    db.add(Practice(**row))
+    await record_practice(db, user_id, row["time"], row["correct"], row["count"])
+    await db.commit()
+
+
+@router.get("/questions")
+async def get_questions(
+    request: Request,
+    count: int = Query(10, ge=1, le=QuizSettings.MAX_BATCH_SIZE),
+    token: str = Header(None),
+):
+    user_data = await verify_token(request, token)
+    user_id = user_data["id"]
+    if user_data["role"] != "student":
+        raise HTTPException(status_code=403, detail="Access forbidden.")
+
+    served = await session_store.serve_questions(f"started_test_{user_id}", count)
+    if served:
+        seed, start, count = served["seed"], served["start"], served["count"]
+        time_limit = served["question_time_limit"]
+    else:
+        practice_data = await session_store.get_data(f"practice_{user_id}")
+        # Practices started before seeded questions cannot be resumed.
+        if not practice_data or "seed" not in practice_data:
+            raise HTTPException(
+                status_code=404, detail="Test or practice not started"
+            )
+        seed, start = practice_data["seed"], practice_data["total_questions"]
+        time_limit = 0
+
+    questions = questions_at(seed, start, count)
+    return {
+        "question_time_limit": time_limit,
+        "questions": [
+            {"question_id": index, "question": question, "options": options}
+            for index, (question, _, options) in enumerate(questions, start)
+        ],
+    }
 
 
 @router.post("/submit_answer")
@@ -287,50 +326,28 @@ async def submit_answer(
     user_data = await verify_token(request, token)
     user_id = user_data["id"]
 
-    test_data = redis_client.get_data(f"test_data_{user_id}")
-    if not test_data:
+    outcome = await session_store.submit_answer(
+        f"started_test_{user_id}", answer.answer, answer.question_id
+    )
+    if outcome["status"] in ("no_session", "no_question"):
         raise HTTPException(
             status_code=404, detail="Test not started or question not found"
         )
-
-    question_end_time = datetime.fromisoformat(test_data["question_end_time"])
-    if datetime.now() > question_end_time:
-        raise HTTPException(
-            status_code=400, detail="Time for this question has expired"
+    if outcome["status"] == "answered":
+        raise HTTPException(status_code=409, detail="Question already answered")
+
+    _, correct_answer, _ = question_at(outcome["seed"], outcome["index"])
+    is_correct = not outcome["late"] and answer.answer == correct_answer
+    if outcome["status"] == "done":
+        correct_answers = outcome["correct_answers"] + count_correct(
+            outcome["seed"], outcome["answers"]
         )
-
-    correct_answer = test_data["correct_answer"]
-    started_test = redis_client.get_data(f"started_test_{user_id}")
-    if not started_test:
+        await save_result(db, user_id, outcome["assignment_id"], correct_answers)
+    if outcome["late"]:
         raise HTTPException(
-            status_code=404, detail="Test not started or question not found"
-        )
-
-    questions_left = started_test["questions_left"] - 1
-    correct_answers = started_test["correct_answers"]
-    if answer.answer == correct_answer:
-        correct_answers += 1
-
-    if questions_left == 0:
-        new_result = Result(
-            student_id=user_id,
-            test_id=started_test["assignment_id"],
-            last_attempt_time=datetime.now(),
-            outcome={"correct_answers": correct_answers},
+            status_code=400, detail="Time for this question has expired"
         )
-        db.add(new_result)
-        await db.commit()
-        await db.refresh(new_result)
-        redis_client.delete_data(f"started_test_{user_id}")
-    else:
-        updated_test_data = {
-            "questions_left": questions_left,
-            "correct_answers": correct_answers,
-            **started_test,
-        }
-        redis_client.set_data(f"started_test_{user_id}", updated_test_data)
-
-    return {"is_correct": answer.answer == correct_answer}
+    return {"is_correct": is_correct}
 
 
 @router.post("/start_practice")
@@ -349,9 +366,10 @@ async def start_practice(request: Request, token: str = Header(None)):
         "correct_answers": 0,
         "total_questions": 0,
         "student_id": user_data["id"],
+        "seed": new_seed(),
     }
 
-    redis_client.set_data(f"practice_{user_data['id']}", practice_data)
+    await session_store.set_data(f"practice_{user_data['id']}", practice_data)
 
     return {"message": "Practice started."}
 
@@ -370,23 +388,20 @@ async def get_practice_question(request: Request, token: str = Header(None)):
             detail="Access forbidden. Only students can participate in practice.",
         )
 
-    practice_data = redis_client.get_data(f"practice_{user_id}")
+    practice_data = await session_store.get_data(f"practice_{user_id}")
 
-    if not practice_data:
+    if not practice_data or "seed" not in practice_data:
 
         raise HTTPException(status_code=404, detail="Practice not started.")
 
-    question, correct_answer, options = generate_question()
+    index = practice_data["total_questions"]
 
-    practice_question_data = {
-        "correct_answer": correct_answer,
-    }
-
-    redis_client.set_data(f"practice_question_{user_id}", practice_question_data)
+    question, _, options = question_at(practice_data["seed"], index)
 
     return {
         "question": question,
         "options": options,
+        "question_id": index,
     }
 
 
@@ -408,33 +423,36 @@ async def submit_practice_answer(
             detail="Access forbidden. Only students can participate in practice.",
         )
 
-    practice_data = redis_client.get_data(f"practice_{user_id}")
+    practice_data = await session_store.get_data(f"practice_{user_id}")
 
-    if not practice_data:
+    if not practice_data or "seed" not in practice_data:
 
         raise HTTPException(status_code=404, detail="Practice not started.")
 
-    practice_question_data = redis_client.get_data(f"practice_question_{user_id}")
+    # Skipping ahead within a batch counts the skipped questions as unanswered.
+    index = practice_data["total_questions"]
 
-    if not practice_question_data:
+    if answer.question_id is not None:
 
-        raise HTTPException(status_code=404, detail="No active question found.")
+        if answer.question_id < index:
 
-    correct_answer = practice_question_data["correct_answer"]
+            raise HTTPException(status_code=409, detail="Question already answered")
 
-    if answer.answer == correct_answer:
+        if answer.question_id >= index + QuizSettings.MAX_BATCH_SIZE:
 
-        is_correct = True
+            raise HTTPException(status_code=404, detail="Question not found")
 
-        practice_data["correct_answers"] += 1
+        index = answer.question_id
 
-    else:
+    _, correct_answer, _ = question_at(practice_data["seed"], index)
 
-        is_correct = False
+    is_correct = answer.answer == correct_answer
 
-    practice_data["total_questions"] += 1
+    practice_data["correct_answers"] += is_correct
 
-    redis_client.set_data(f"practice_{user_id}", practice_data)
+    practice_data["total_questions"] = index + 1
+
+    await session_store.set_data(f"practice_{user_id}", practice_data)
 
     return {"is_correct": is_correct}
 
@@ -454,28 +472,15 @@ async def end_practice(
             status_code=403, detail="Access forbidden. Only students can end practice."
         )
 
-    practice_data = redis_client.get_data(f"practice_{user_id}")
+    practice_data = await session_store.get_data(f"practice_{user_id}")
 
     if not practice_data:
 
         raise HTTPException(status_code=404, detail="Practice not started.")
 
-    new_practice = Practice(
-        student_id=user_id,
-        time=datetime.now(),
-        correct=practice_data["correct_answers"],
-        count=practice_data["total_questions"],
-    )
-
-    db.add(new_practice)
-
-    await db.commit()
-
-    await db.refresh(new_practice)
+    await save_practice(db, user_id, practice_data)
 
-    redis_client.delete_data(f"practice_{user_id}")
-
-    redis_client.delete_data(f"practice_question_{user_id}")
+    await session_store.delete_data(f"practice_{user_id}")
 
     return {
         "message": "Practice ended.",
@@ -509,6 +514,7 @@ async def new_Assignment(
         db.add(new_assigment)
         await db.commit()
         await db.refresh(new_assigment)
+        await session_store.bump_versions(class_scope(assigment.class_id))
         return {"msg": f"succes create"}
     return {"msg": f"you are not a teacher {user_data['role']}"}
 
@@ -521,21 +527,175 @@ async def new_Assignment(
     db: AsyncSession = Depends(get_db),
 ):
     user_data = await verify_token(request, token)
-    current_class = (
-        await db.execute(select(Class).where(Class.id == class_id))
-    ).scalar_one_or_none()
-    if user_data["role"] == "teacher" and current_class.teacher_id == user_data["id"]:
-        assignments = (
-            (await db.execute(select(Test).where(Test.class_id == class_id)))
-            .scalars()
-            .all()
+    scope = class_scope(class_id)
+    version, cached = await session_store.get_cached(scope, "assignments")
+    if cached is None:
+        teacher_id = await db.scalar(queries.class_owner_query(class_id))
+        if teacher_id is None:
+            raise HTTPException(status_code=404, detail="Class not found")
+        assignments = await db.execute(queries.class_assignments_query(class_id))
+        cached = {
+            "teacher_id": teacher_id,
+            "assignments": [dto.assignment(row) for row in assignments],
+        }
+        await session_store.set_cached(
+            scope, "assignments", version, cached, CacheSettings.RESPONSE_TTL
         )
-        return {"assignments": assignments}
+    if user_data["role"] == "teacher" and cached["teacher_id"] == user_data["id"]:
+        return ORJSONResponse({"assignments": cached["assignments"]})
+    raise HTTPException(status_code=403, detail="Access denied")
+
+
+RESULT_EXPORT_COLUMNS = (
+    "result_id",
+    "student_id",
+    "assignment_id",
+    "assignment_name",
+    "last_attempt_time",
+    "outcome",
+)
 
 
-@router.get("/classes/{class_id}/students")
-async def stundents_in_class():
-    pass
+def result_export_query(class_id: int, assignment_id: Optional[int] = None):
+    query = (
+        select(
+            Result.id,
+            Result.student_id,
+            Result.test_id,
+            Test.test_name,
+            Result.last_attempt_time,
+            Result.outcome,
+        )
+        .join(Test, Test.id == Result.test_id)
+        .where(Test.class_id == class_id)
+        .order_by(Result.test_id, Result.student_id, Result.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+    if assignment_id is not None:
+        query = query.where(Result.test_id == assignment_id)
+    return query
+
+
+async def result_export_rows(class_id: int, assignment_id: Optional[int]):
+    """Yield chunks of Result rows of a class from a server-side cursor.
+
+    Streaming responses are sent after the request's dependencies have
+    closed, so the generator opens its own session.
+    """
+    async with SessionLocal() as db:
+        result = await db.stream(result_export_query(class_id, assignment_id))
+        async for rows in result.partitions():
+            yield rows
+
+
+async def results_csv(class_id: int, assignment_id: Optional[int]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(RESULT_EXPORT_COLUMNS)
+    # The header goes out before the query runs.
+    yield buffer.getvalue()
+    async for rows in result_export_rows(class_id, assignment_id):
+        buffer.seek(0)
+        buffer.truncate()
+        for *fields, outcome in rows:
+            writer.writerow([*fields, json.dumps(outcome)])
+        yield buffer.getvalue()
+
+
+async def results_ndjson(class_id: int, assignment_id: Optional[int]):
+    async for rows in result_export_rows(class_id, assignment_id):
+        yield "".join(
+            json.dumps(dict(zip(RESULT_EXPORT_COLUMNS, row)), default=str) + "\n"
+            for row in rows
+        )
+
+
+async def check_class_owner(
+    request: Request, token: str, db: AsyncSession, class_id: int
+):
+    user_data = await verify_token(request, token)
+    if user_data["role"] != "teacher":
+        raise HTTPException(status_code=403, detail="Access denied")
+    teacher_id = await db.scalar(queries.class_owner_query(class_id))
+    if teacher_id is None:
+        raise HTTPException(status_code=404, detail="Class not found")
+    if teacher_id != user_data["id"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+
+@router.get("/classes/{class_id}/results.csv")
+async def export_results_csv(
+    class_id: int,
+    request: Request,
+    assignment_id: Optional[int] = None,
+    token: str = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await check_class_owner(request, token, db, class_id)
+    return StreamingResponse(
+        results_csv(class_id, assignment_id),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="class_{class_id}_results.csv"'
+            )
+        },
+    )
+
+
+@router.get("/classes/{class_id}/results.ndjson")
+async def export_results_ndjson(
+    class_id: int,
+    request: Request,
+    assignment_id: Optional[int] = None,
+    token: str = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await check_class_owner(request, token, db, class_id)
+    return StreamingResponse(
+        results_ndjson(class_id, assignment_id), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/classes/{class_id}/gradebook", response_model=GradebookResponse)
+async def get_gradebook(
+    class_id: int,
+    request: Request,
+    token: str = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await check_class_owner(request, token, db, class_id)
+    scope = class_scope(class_id)
+    version, gradebook = await session_store.get_cached(scope, "gradebook")
+    if gradebook is None:
+        gradebook = await class_gradebook(db, class_id)
+        await session_store.set_cached(
+            scope, "gradebook", version, gradebook, CacheSettings.GRADEBOOK_TTL
+        )
+    return ORJSONResponse(gradebook)
+
+
+@router.get("/classes/{class_id}/students", response_model=ClassStudents)
+async def stundents_in_class(
+    class_id: int,
+    request: Request,
+    token: str = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await check_class_owner(request, token, db, class_id)
+    student_ids = (await db.scalars(queries.roster_query(class_id))).all()
+    try:
+        profiles = await auth_client.get_profiles(student_ids)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Auth service unavailable")
+    return ORJSONResponse(
+        {
+            "students": [
+                {"id": student_id, "email": profiles.get(student_id, {}).get("email")}
+                for student_id in student_ids
+            ]
+        }
+    )
 
 
 @router.get("/homeworks")
@@ -548,18 +708,12 @@ async def get_homeworks(
     if user_data["role"] != "student":
         return {"msg": f"You are not a student, your role is {user_data['role']}"}
 
-    query = select(Class.id).where(Class.student_ids.contains([user_id]))
-    result = await db.execute(query)
-    class_ids = [row[0] for row in result.fetchall()]
+    query = queries.open_homeworks_query(user_id, datetime.now())
+    homeworks = [dto.homework(row) for row in await db.execute(query)]
 
-    if not class_ids:
-        return {"msg": "No classes found for the student"}
-
-    current_time = datetime.now()
-    query = select(Test).where(
-        Test.class_id.in_(class_ids), Test.hand_in_by_date > current_time
-    )
-    result = await db.execute(query)
-    homeworks = result.scalars().all()
+    if not homeworks:
+        enrolled = await db.scalar(queries.any_membership_query(user_id))
+        if enrolled is None:
+            return {"msg": "No classes found for the student"}
 
-    return {"homeworks": [hw.__dict__ for hw in homeworks]}
+    return ORJSONResponse({"homeworks": homeworks})
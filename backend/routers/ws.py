@@ -0,0 +1,349 @@
+"""Practice and assignment sessions over one WebSocket.
+
+The client authenticates once with its first frame, then every answer is one
+frame each way:
+
+    -> {"type": "start", "token": ..., "mode": "practice"}
+    -> {"type": "start", "token": ..., "mode": "assignment", "assignment_id": 3}
+    <- {"type": "question", "question_id": 0, "question": ..., "options": [...],
+        "time_limit": 30}
+    -> {"type": "answer", "answer": ..., "question_id": 0}
+    <- {"type": "result", "is_correct": ..., "late": ..., "correct_answers": ...,
+        "total_questions": ..., "questions_left": ..., "next": {question} | null}
+    -> {"type": "end"}
+    <- {"type": "summary", "correct_answers": ..., "total_questions": ...}
+
+"next" is null once an assignment is complete; its result is then saved and
+the server closes the socket. Practice runs until the client sends "end".
+An answer carrying the question_id of a question that was already scored,
+e.g. one that ran out of time, is rejected instead of scoring the next one.
+Frames are JSON text; binary or malformed frames get an error frame.
+
+The session is held in memory by the connection. It is checkpointed to the
+Redis keys the HTTP routes use every CHECKPOINT_EVERY answers and when the
+socket drops, so the student can carry on over HTTP or reconnect with
+"resume": true and get the same question back. Assignment deadlines are
+kept by the server: a question not answered in time is scored as missed and
+the next one is sent.
+"""
+
+from typing import Optional
+import asyncio
+import json
+import time
+import orjson
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
+from sqlalchemy.future import select
+from db import SessionLocal
+from db.models import Test
+from jwt_auth import verify_token
+from session_store import session_store
+from trig_quiz import count_correct, new_seed, question_at
+from core.config import SessionSocketSettings
+from routers.pydantic_models import Answer, SessionStart
+from routers.routes import save_practice, save_result
+
+router = APIRouter(prefix="/api")
+
+
+class QuizSession:
+    """A student's practice or assignment run, owned by one connection."""
+
+    def __init__(
+        self,
+        student_id: int,
+        seed: Optional[int] = None,
+        assignment_id: Optional[int] = None,
+        time_limit: int = 0,
+        questions_left: Optional[int] = None,
+        correct_answers: int = 0,
+        total_questions: int = 0,
+        active_since: Optional[float] = None,
+    ):
+        self.student_id = student_id
+        self.seed = new_seed() if seed is None else seed
+        self.assignment_id = assignment_id
+        self.time_limit = time_limit
+        self.questions_left = questions_left
+        self.correct_answers = correct_answers
+        # Also the index of the current question in the seed's stream.
+        self.total_questions = total_questions
+        self.active_since = active_since or time.time()
+        # When the current question was first served, over HTTP or here.
+        self.served_at = None
+        self.correct_answer = None
+        self.deadline = None
+        self.unsaved = 0
+        # Once the assignment hash is this session's it is updated in place,
+        # so answer_<i> fields recorded over HTTP are only dropped after
+        # open_session has replayed them into the tally.
+        self.stored = False
+        self.replayed = ()
+        self.finished = False
+
+    @property
+    def is_assignment(self) -> bool:
+        return self.assignment_id is not None
+
+    @property
+    def done(self) -> bool:
+        return self.is_assignment and self.questions_left <= 0
+
+    def ask(self) -> dict:
+        question, self.correct_answer, options = question_at(
+            self.seed, self.total_questions
+        )
+        if self.served_at is None:
+            self.served_at = time.time()
+        if self.time_limit:
+            started = max(self.active_since, self.served_at)
+            self.deadline = started + self.time_limit
+        return {
+            "question_id": self.total_questions,
+            "question": question,
+            "options": options,
+            "time_limit": self.time_limit,
+        }
+
+    def timeout(self) -> float:
+        """Seconds to wait for the next frame."""
+        if self.deadline is None:
+            return SessionSocketSettings.IDLE_TIMEOUT
+        return max(0.0, self.deadline - time.time())
+
+    def score(self, answer, late: bool = False) -> dict:
+        late = late or (self.deadline is not None and time.time() > self.deadline)
+        is_correct = not late and answer == self.correct_answer
+        self.correct_answers += is_correct
+        self.total_questions += 1
+        if self.is_assignment:
+            self.questions_left -= 1
+        self.correct_answer = self.deadline = self.served_at = None
+        self.active_since = time.time()
+        self.unsaved += 1
+        return {
+            "is_correct": is_correct,
+            "late": late,
+            "correct_answers": self.correct_answers,
+            "total_questions": self.total_questions,
+            "questions_left": self.questions_left,
+        }
+
+    def summary(self) -> dict:
+        return {
+            "type": "summary",
+            "correct_answers": self.correct_answers,
+            "total_questions": self.total_questions,
+        }
+
+    async def checkpoint(self):
+        student_id = self.student_id
+        if self.is_assignment:
+            state = {
+                "questions_left": self.questions_left,
+                "question_time_limit": self.time_limit,
+                "correct_answers": self.correct_answers,
+                "assignment_id": self.assignment_id,
+                "student_id": student_id,
+                "seed": self.seed,
+                "next": self.total_questions,
+                "active_since": self.active_since,
+            }
+            if self.served_at is not None:
+                state["served"] = self.total_questions
+                state[f"served_at_{self.total_questions}"] = self.served_at
+            key = f"started_test_{student_id}"
+            if self.stored:
+                await session_store.update_hash(key, state, *self.replayed)
+            else:
+                await session_store.set_hash(key, state)
+            self.stored, self.replayed = True, ()
+        else:
+            await session_store.set_data(
+                f"practice_{student_id}",
+                {
+                    "correct_answers": self.correct_answers,
+                    "total_questions": self.total_questions,
+                    "student_id": student_id,
+                    "seed": self.seed,
+                },
+            )
+        self.unsaved = 0
+
+    async def finish(self):
+        student_id = self.student_id
+        async with SessionLocal() as db:
+            if self.is_assignment:
+                await save_result(
+                    db, student_id, self.assignment_id, self.correct_answers
+                )
+                key = f"started_test_{student_id}"
+            else:
+                await save_practice(
+                    db,
+                    student_id,
+                    {
+                        "correct_answers": self.correct_answers,
+                        "total_questions": self.total_questions,
+                    },
+                )
+                key = f"practice_{student_id}"
+        await session_store.delete_data(key)
+        self.finished = True
+
+
+async def open_session(student_id: int, start: SessionStart) -> QuizSession:
+    if start.mode == "practice":
+        practice_data = None
+        if start.resume:
+            practice_data = await session_store.get_data(f"practice_{student_id}")
+        if practice_data and "seed" in practice_data:
+            return QuizSession(
+                student_id,
+                seed=practice_data["seed"],
+                correct_answers=practice_data["correct_answers"],
+                total_questions=practice_data["total_questions"],
+            )
+        return QuizSession(student_id)
+
+    async with SessionLocal() as db:
+        test = (
+            await db.execute(
+                select(Test.number_of_questions, Test.time_to_answer).where(
+                    Test.id == start.assignment_id
+                )
+            )
+        ).one_or_none()
+    if test is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    session = QuizSession(
+        student_id,
+        assignment_id=start.assignment_id,
+        time_limit=test.time_to_answer,
+        questions_left=test.number_of_questions,
+    )
+    started_test = None
+    if start.resume:
+        started_test = await session_store.get_hash(f"started_test_{student_id}")
+    if (
+        started_test
+        and "seed" in started_test
+        and int(started_test["assignment_id"]) == start.assignment_id
+    ):
+        # Answers given over HTTP since the last checkpoint are replayed.
+        answers = {
+            int(field[len("answer_") :]): json.loads(value)
+            for field, value in started_test.items()
+            if field.startswith("answer_")
+        }
+        session.stored = True
+        session.replayed = tuple(f"answer_{index}" for index in answers)
+        session.seed = int(started_test["seed"])
+        session.total_questions = int(started_test["next"])
+        session.active_since = float(started_test["active_since"])
+        served_at = started_test.get(f"served_at_{session.total_questions}")
+        if served_at is not None:
+            session.served_at = float(served_at)
+        session.questions_left = int(started_test["questions_left"])
+        session.correct_answers = int(started_test["correct_answers"]) + (
+            count_correct(session.seed, answers)
+        )
+    return session
+
+
+async def receive(websocket: WebSocket, timeout: float):
+    """The next frame as JSON; raises ValueError for binary or malformed ones."""
+    message = await asyncio.wait_for(websocket.receive(), timeout)
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+    if message.get("text") is None:
+        raise ValueError("Binary frames are not supported")
+    return orjson.loads(message["text"])
+
+
+async def send(websocket: WebSocket, frame: dict):
+    await websocket.send_text(orjson.dumps(frame).decode())
+
+
+@router.websocket("/ws/session")
+async def quiz_session(websocket: WebSocket):
+    await websocket.accept()
+    try:
+        start = SessionStart.model_validate(
+            await receive(websocket, SessionSocketSettings.IDLE_TIMEOUT)
+        )
+        user_data = await verify_token(websocket, start.token)
+        if user_data["role"] != "student":
+            raise HTTPException(status_code=403, detail="Access forbidden.")
+        if start.mode == "assignment" and start.assignment_id is None:
+            raise HTTPException(status_code=400, detail="assignment_id is required")
+        session = await open_session(user_data["id"], start)
+    except WebSocketDisconnect:
+        return
+    except asyncio.TimeoutError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    except (ValueError, HTTPException) as exc:
+        if isinstance(exc, HTTPException):
+            detail = exc.detail
+        else:
+            detail = "Invalid start frame"
+        await send(websocket, {"type": "error", "detail": detail})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        await session.checkpoint()
+        await send(websocket, {"type": "question", **session.ask()})
+
+        while True:
+            try:
+                frame = await receive(websocket, session.timeout())
+                kind = frame.get("type") if isinstance(frame, dict) else None
+                if kind == "answer":
+                    answer = Answer.model_validate(frame)
+                    if answer.question_id not in (None, session.total_questions):
+                        await send(
+                            websocket,
+                            {"type": "error", "detail": "Question already answered"},
+                        )
+                        continue
+                    result = session.score(answer.answer)
+            except asyncio.TimeoutError:
+                if session.deadline is None:
+                    break
+                kind, result = "answer", session.score(None, late=True)
+            except ValueError:
+                await send(websocket, {"type": "error", "detail": "Malformed frame"})
+                continue
+
+            if kind == "answer":
+                if session.done:
+                    await session.finish()
+                    await send(websocket, {"type": "result", **result, "next": None})
+                    await websocket.close()
+                    return
+                if session.unsaved >= SessionSocketSettings.CHECKPOINT_EVERY:
+                    await session.checkpoint()
+                await send(
+                    websocket, {"type": "result", **result, "next": session.ask()}
+                )
+            elif kind == "end" and not session.is_assignment:
+                await session.finish()
+                await send(websocket, session.summary())
+                await websocket.close()
+                return
+            else:
+                await send(websocket, {"type": "error", "detail": "Unknown frame"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Also on an unexpected error, so the answers since the last
+        # checkpoint can be resumed.
+        if not session.finished:
+            await session.checkpoint()
+
+    if websocket.client_state == WebSocketState.CONNECTED:
+        await websocket.close()
@@ -0,0 +1,71 @@
+"""Rebuild student_stats from the practices table.
+
+Run from the backend directory: python -m scripts.backfill_student_stats
+
+Run it once after applying the student_stats migration and before the new
+end_practice code takes traffic; practices finished while it runs may be
+counted twice. Re-running it recomputes every row from scratch.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+import asyncio
+from sqlalchemy import delete, func, insert, select
+from db import engine
+from db.models import Practice, StudentStats
+
+
+def _streak(days):
+    """Length of the run of consecutive days ending at the latest one."""
+    streak = 1
+    for later, earlier in zip(days, days[1:]):
+        if later - earlier != timedelta(days=1):
+            break
+        streak += 1
+    return streak
+
+
+async def backfill():
+    async with engine.begin() as conn:
+        totals = await conn.execute(
+            select(
+                Practice.student_id,
+                func.count(),
+                func.coalesce(func.sum(Practice.correct), 0),
+                func.coalesce(func.sum(Practice.count), 0),
+                func.max(Practice.time),
+            ).group_by(Practice.student_id)
+        )
+        active_days = defaultdict(list)
+        for student_id, day in await conn.execute(
+            select(Practice.student_id, Practice.time)
+            .where(Practice.time.is_not(None))
+            .distinct()
+            .order_by(Practice.student_id, Practice.time.desc())
+        ):
+            active_days[student_id].append(day)
+
+        rows = []
+        for student_id, sessions, correct, count, last_activity in totals:
+            days = active_days[student_id]
+            rows.append(
+                {
+                    "student_id": student_id,
+                    "total_sessions": sessions,
+                    "correct_sum": correct,
+                    "count_sum": count,
+                    "last_activity": last_activity,
+                    "current_streak": _streak(days) if days else 0,
+                    "last_streak_day": days[0] if days else None,
+                }
+            )
+
+        await conn.execute(delete(StudentStats))
+        if rows:
+            await conn.execute(insert(StudentStats), rows)
+    await engine.dispose()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    print(f"backfilled {asyncio.run(backfill())} students")
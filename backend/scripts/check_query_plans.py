@@ -0,0 +1,136 @@
+"""Fail if a hot route query plans a sequential scan on seeded data.
+
+Run from the backend directory against a migrated PostgreSQL database:
+python -m scripts.check_query_plans
+
+tests/test_query_plans.py runs the same check under pytest when
+TEST_DATABASE_URL points at such a database, and is skipped otherwise.
+
+Seed rows are inserted, analysed and EXPLAINed inside one transaction that
+is rolled back, so the database is left as it was. Exits with status 1 and
+lists the offending queries when any plan reads a seeded table with a
+Seq Scan.
+"""
+
+from datetime import datetime
+import asyncio
+import json
+import sys
+from sqlalchemy import text
+from sqlalchemy.future import select
+from db import engine
+from db.gradebook import enrolled_count_query, gradebook_query
+from db.models import Class, ClassMembership, Test
+from routers import queries
+from routers.routes import result_export_query
+
+TABLES = ("classes", "class_memberships", "tests", "results", "practices")
+
+SEED = (
+    """
+    INSERT INTO classes (teacher_id, cl_name, join_code, student_ids)
+    SELECT 1000000 + g % 500, 'plan-check', 'plan' || g, '{}'
+    FROM generate_series(1, 2000) g
+    """,
+    """
+    INSERT INTO class_memberships (class_id, student_id)
+    SELECT c.id, 2000000 + (c.id * 7 + s) % 50000
+    FROM classes c, generate_series(1, 30) s
+    WHERE c.cl_name = 'plan-check'
+    """,
+    """
+    INSERT INTO tests (
+        class_id, test_name, hand_in_by_date, created_date, multiple_attempts,
+        number_of_questions, time_to_answer, completed_by
+    )
+    SELECT c.id, 'plan-check', current_date + t - 3, current_date, true, 10, 30, 0
+    FROM classes c, generate_series(1, 5) t
+    WHERE c.cl_name = 'plan-check'
+    """,
+    """
+    INSERT INTO results (student_id, test_id, last_attempt_time, outcome)
+    SELECT m.student_id, t.id, current_date, '{"correct_answers": 5}'
+    FROM tests t JOIN class_memberships m ON m.class_id = t.class_id
+    WHERE t.test_name = 'plan-check'
+    """,
+    """
+    INSERT INTO practices (student_id, time, correct, count)
+    SELECT 2000000 + g % 50000, current_date - g % 365, g % 10, 10
+    FROM generate_series(1, 200000) g
+    """,
+)
+
+
+def hot_queries(class_id, teacher_id, student_id, join_code):
+    """The queries routes.py issues, with parameters from the seed."""
+    return {
+        "statistics history": queries.recent_practices_query(student_id),
+        "classes": queries.teacher_classes_query(teacher_id),
+        "join class": queries.join_code_query(join_code, student_id),
+        "class owner": queries.class_owner_query(class_id),
+        "assignments": queries.class_assignments_query(class_id),
+        "homeworks": queries.open_homeworks_query(student_id, datetime.now()),
+        "homeworks enrolled": queries.any_membership_query(student_id),
+        "roster": queries.roster_query(class_id),
+        "results export": result_export_query(class_id),
+        "gradebook": gradebook_query(class_id),
+        "gradebook enrolled": enrolled_count_query(class_id),
+    }
+
+
+def seq_scans(plan):
+    if plan.get("Node Type") == "Seq Scan" and plan["Relation Name"] in TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+async def check() -> dict:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("check_query_plans needs a PostgreSQL LINK")
+    failures = {}
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for statement in SEED:
+                await conn.execute(text(statement))
+            for table in TABLES:
+                await conn.execute(text(f"ANALYZE {table}"))
+            class_id, teacher_id, join_code, student_id = (
+                await conn.execute(
+                    select(
+                        Class.id,
+                        Class.teacher_id,
+                        Class.join_code,
+                        ClassMembership.student_id,
+                    )
+                    .join(ClassMembership, ClassMembership.class_id == Class.id)
+                    .join(Test, Test.class_id == Class.id)
+                    .where(Class.cl_name == "plan-check")
+                    .limit(1)
+                )
+            ).one()
+            plans = hot_queries(class_id, teacher_id, student_id, join_code)
+            for name, query in plans.items():
+                sql = query.compile(
+                    dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+                )
+                plan = await conn.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scanned = sorted(set(seq_scans(plan[0]["Plan"])))
+                if scanned:
+                    failures[name] = scanned
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    failures = asyncio.run(check())
+    for name, tables in failures.items():
+        print(f"{name}: sequential scan on {', '.join(tables)}")
+    if failures:
+        sys.exit(1)
+    print("no sequential scans on hot queries")
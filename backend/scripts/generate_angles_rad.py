@@ -0,0 +1,35 @@
+"""Regenerate trig_quiz/angles_rad.py.
+
+Run from the backend directory: python -m scripts.generate_angles_rad
+
+sympy is only needed here, at build time; the backend imports the generated
+table and never loads sympy while serving requests.
+"""
+
+from pathlib import Path
+import sympy as sp
+
+from trig_quiz.trig_values import angles
+
+TARGET = Path(__file__).resolve().parent.parent / "trig_quiz" / "angles_rad.py"
+
+HEADER = '''"""Radian forms of the angles in trig_values.angles, as sympy prints them.
+
+Generated by scripts/generate_angles_rad.py, do not edit by hand.
+"""
+
+'''
+
+
+def render():
+    lines = ["angles_rad = {"]
+    for quadrant, quadrant_angles in angles.items():
+        values = ", ".join(f'"{sp.pi * angle_deg / 180}"' for angle_deg in quadrant_angles)
+        lines.append(f"    {quadrant}: [{values}],")
+    lines.append("}")
+    return HEADER + "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    TARGET.write_text(render(), encoding="utf-8")
+    print(f"wrote {TARGET}")
@@ -0,0 +1,248 @@
+from collections import Counter
+from pathlib import Path
+from redis.asyncio import Redis, BlockingConnectionPool
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ResponseError
+from core.config import RedisSettings
+import json
+import time
+import orjson
+
+SUBMIT_ANSWER_LUA = (Path(__file__).parent / "submit_answer.lua").read_text()
+SERVE_QUESTIONS_LUA = (Path(__file__).parent / "serve_questions.lua").read_text()
+
+
+def class_scope(class_id: int) -> str:
+    return f"class_{class_id}"
+
+
+def teacher_scope(teacher_id: int) -> str:
+    return f"teacher_{teacher_id}"
+
+
+class TimedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            elapsed = time.perf_counter() - started
+            command = "MULTI" if self.is_transaction else "PIPELINE"
+            for listener in self.listeners:
+                listener(command, elapsed)
+
+
+class TimedRedis(Redis):
+    """Redis client that reports how long every command took.
+
+    Callables appended to ``listeners`` receive the command name and the
+    duration in seconds; a pipeline reports once, as MULTI or PIPELINE.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listeners = []
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            elapsed = time.perf_counter() - started
+            for listener in self.listeners:
+                listener(args[0], elapsed)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str = None):
+        pipe = TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipe.listeners = self.listeners
+        return pipe
+
+
+class SessionStore:
+    def __init__(
+        self,
+        host=RedisSettings.HOST,
+        port=RedisSettings.PORT,
+        db=RedisSettings.DB,
+        max_connections=RedisSettings.POOL_SIZE,
+        timeout=RedisSettings.POOL_TIMEOUT,
+    ):
+        # A blocking pool makes a burst of requests wait for a free connection
+        # instead of failing once every connection is checked out.
+        self.pool = BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=max_connections,
+            timeout=timeout,
+        )
+        self.client = TimedRedis(connection_pool=self.pool)
+        self.submit_answer_script = self.client.register_script(SUBMIT_ANSWER_LUA)
+        self.serve_questions_script = self.client.register_script(
+            SERVE_QUESTIONS_LUA
+        )
+        self.cache_hits = Counter()
+        self.cache_misses = Counter()
+
+    @staticmethod
+    def _load(value):
+        if value:
+            return orjson.loads(value)
+        return None
+
+    async def set_data(self, key: str, data: dict, expiration: int = None):
+        """Set data in Redis with optional expiration time."""
+        await self.client.set(key, orjson.dumps(data), ex=expiration or None)
+
+    async def get_data(self, key: str):
+        """Get data from Redis."""
+        return self._load(await self.client.get(key))
+
+    async def set_hash(self, key: str, data: dict, *stale_keys: str):
+        """Replace a hash, dropping related keys, in one transaction."""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key, *stale_keys)
+            pipe.hset(key, mapping=data)
+            await pipe.execute()
+
+    async def get_hash(self, key: str):
+        """Get a hash as a dict of strings, or None if it does not exist.
+
+        Keys left as JSON strings by older releases also read as None.
+        """
+        try:
+            data = await self.client.hgetall(key)
+        except ResponseError as error:
+            if not str(error).startswith("WRONGTYPE"):
+                raise
+            return None
+        if not data:
+            return None
+        return {field.decode(): value.decode() for field, value in data.items()}
+
+    async def update_hash(self, key: str, data: dict, *stale_fields: str):
+        """Set some fields of an existing hash and drop others, atomically."""
+        async with self.client.pipeline(transaction=True) as pipe:
+            if stale_fields:
+                pipe.hdel(key, *stale_fields)
+            pipe.hset(key, mapping=data)
+            await pipe.execute()
+
+    async def serve_questions(self, session_key: str, count: int = 1):
+        """Hand out the next questions of an assignment session.
+
+        See serve_questions.lua; starts each question's timer the first time
+        it is served. Returns the session's seed, the first index served and
+        how many were served, at most the questions left, or None without a
+        session.
+        """
+        served = await self.serve_questions_script(
+            keys=[session_key], args=[time.time(), count], client=self.client
+        )
+        if served is None:
+            return None
+        start, count, seed, time_limit = served
+        return {
+            "seed": seed.decode(),
+            "start": start,
+            "count": count,
+            "question_time_limit": time_limit,
+        }
+
+    async def submit_answer(self, session_key: str, answer, question_id: int = None):
+        """Record an assignment answer atomically with one script call.
+
+        See submit_answer.lua for the rules; without ``question_id`` the
+        first unanswered question is answered. The caller scores the answer
+        from the returned seed and index. Once the last question is consumed
+        the session hash is deleted, and the result holds the correct count
+        carried in the hash plus every recorded answer by index.
+        """
+        status, index, late, questions_left, seed, assignment_id, fields = (
+            await self.submit_answer_script(
+                keys=[session_key],
+                args=[
+                    json.dumps(answer),
+                    time.time(),
+                    "" if question_id is None else question_id,
+                ],
+                client=self.client,
+            )
+        )
+        outcome = {
+            "status": status.decode(),
+            "index": index,
+            "late": bool(late),
+            "questions_left": questions_left,
+            "seed": seed.decode(),
+            "assignment_id": int(assignment_id),
+        }
+        if fields:
+            session = dict(zip(fields[::2], fields[1::2]))
+            outcome["correct_answers"] = int(session[b"correct_answers"])
+            outcome["answers"] = {
+                int(field[len(b"answer_") :]): json.loads(value)
+                for field, value in session.items()
+                if field.startswith(b"answer_")
+            }
+        return outcome
+
+    async def get_cached(self, scope: str, name: str):
+        """Read a cached value together with the current version of its scope.
+
+        Returns ``(version, data)``; data is None on a miss or when the entry
+        was stored under an older version.
+        """
+        version, cached = await self.client.mget(
+            f"cache_version_{scope}", f"cache_{scope}_{name}"
+        )
+        version = int(version or 0)
+        cached = self._load(cached)
+        if cached is None or cached["version"] != version:
+            self.cache_misses[name] += 1
+            return version, None
+        self.cache_hits[name] += 1
+        return version, cached["data"]
+
+    async def set_cached(
+        self, scope: str, name: str, version: int, data, expiration: int
+    ):
+        """Store a value computed while its scope was at ``version``.
+
+        A value computed before an invalidation carries the old version and
+        is never served afterwards.
+        """
+        await self.set_data(
+            f"cache_{scope}_{name}", {"version": version, "data": data}, expiration
+        )
+
+    async def bump_versions(self, *scopes: str):
+        """Invalidate every cached value of the given scopes."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(f"cache_version_{scope}")
+            await pipe.execute()
+
+    def cache_stats(self) -> dict:
+        """Hits and misses of get_cached per cached value name."""
+        return {
+            name: {"hits": self.cache_hits[name], "misses": self.cache_misses[name]}
+            for name in sorted(self.cache_hits.keys() | self.cache_misses.keys())
+        }
+
+    async def delete_data(self, *keys: str):
+        """Delete one or more keys from Redis."""
+        await self.client.delete(*keys)
+
+    async def key_exists(self, key: str) -> bool:
+        """Check if a key exists in Redis."""
+        return await self.client.exists(key) > 0
+
+    async def close(self):
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+
+session_store = SessionStore()
@@ -0,0 +1,39 @@
+-- Serve the next questions of an assignment session.
+--
+-- KEYS[1]  session hash (started_test_<id>)
+-- ARGV[1]  current time, seconds since the epoch
+-- ARGV[2]  how many questions to serve, starting at the first unanswered one
+--
+-- Each question's timer starts the first time it is served: its time is
+-- kept under served_at_<index> and not moved by later requests. ``served``
+-- is the highest index served so far; submit_answer.lua only accepts
+-- answers to served questions.
+--
+-- Returns {next, count, seed, question_time_limit}, with count capped by the
+-- questions left, or nil when there is no session. Keys that are not a hash
+-- with a seed predate seeded sessions and count as no session.
+
+local session = KEYS[1]
+local now, count = ARGV[1], tonumber(ARGV[2])
+
+if redis.call("TYPE", session).ok ~= "hash" then
+    return nil
+end
+local state = redis.call(
+    "HMGET", session, "next", "seed", "question_time_limit", "questions_left",
+    "served"
+)
+if not state[1] or not state[2] then
+    return nil
+end
+
+local next_index = tonumber(state[1])
+count = math.min(count, tonumber(state[4]))
+local last = next_index + count - 1
+for index = next_index, last do
+    redis.call("HSETNX", session, "served_at_" .. index, now)
+end
+if not state[5] or tonumber(state[5]) < last then
+    redis.call("HSET", session, "served", last)
+end
+return {next_index, count, state[2], tonumber(state[3])}
@@ -0,0 +1,74 @@
+-- Record one answer of an assignment session atomically.
+--
+-- KEYS[1]  session hash (started_test_<id>)
+-- ARGV[1]  submitted answer, JSON encoded
+-- ARGV[2]  current time, seconds since the epoch
+-- ARGV[3]  question index, or "" for the first unanswered one
+--
+-- Questions are derived from the session seed and their index, so the
+-- script only moves the cursor and records the answer under answer_<index>;
+-- the caller scores it. ``next`` is the first unanswered index, ``served``
+-- the highest index serve_questions.lua handed out and ``active_since`` the
+-- time of the previous answer. Only served questions can be answered, each
+-- once; without an index the answer is for ``next``, which GET /question
+-- serves. A question's timer starts when it was first served, or at the
+-- previous answer for questions served ahead in a batch. Skipped questions
+-- count as unanswered, each using its full time limit. Late answers are not
+-- recorded.
+--
+-- Returns {status, index, late, questions_left, seed, assignment_id, fields};
+-- status is "ok", "done", "no_session", "no_question" or "answered". Keys
+-- that are not a hash with a seed predate seeded sessions and count as
+-- "no_session". When
+-- the last question is consumed the hash is deleted and fields holds its
+-- final contents as a flat field/value list.
+
+local session = KEYS[1]
+local answer, now, question_id = ARGV[1], tonumber(ARGV[2]), ARGV[3]
+
+if redis.call("TYPE", session).ok ~= "hash" then
+    return {"no_session", 0, 0, 0, "", 0, {}}
+end
+local state = redis.call(
+    "HMGET", session, "next", "active_since", "question_time_limit",
+    "questions_left", "seed", "assignment_id", "served"
+)
+if not state[1] or not state[5] then
+    return {"no_session", 0, 0, 0, "", 0, {}}
+end
+if not state[7] then
+    return {"no_question", 0, 0, 0, "", 0, {}}
+end
+
+local next_index, served = tonumber(state[1]), tonumber(state[7])
+local index = next_index
+if question_id ~= "" then
+    index = tonumber(question_id)
+end
+if index < next_index then
+    return {"answered", index, 0, 0, "", 0, {}}
+end
+if index > served then
+    return {"no_question", index, 0, 0, "", 0, {}}
+end
+local consumed = index - next_index + 1
+
+local served_at = redis.call("HGET", session, "served_at_" .. next_index)
+local started = math.max(tonumber(state[2]), tonumber(served_at or state[2]))
+local deadline = started + consumed * tonumber(state[3])
+local late = now > deadline and 1 or 0
+for skipped = next_index, index do
+    redis.call("HDEL", session, "served_at_" .. skipped)
+end
+if late == 0 then
+    redis.call("HSET", session, "answer_" .. index, answer)
+end
+redis.call("HSET", session, "next", index + 1, "active_since", ARGV[2])
+local questions_left = redis.call("HINCRBY", session, "questions_left", -consumed)
+
+if questions_left <= 0 then
+    local fields = redis.call("HGETALL", session)
+    redis.call("DEL", session)
+    return {"done", index, late, 0, state[5], state[6], fields}
+end
+return {"ok", index, late, questions_left, state[5], state[6], {}}
@@ -0,0 +1,114 @@
+"""Test setup for the backend.
+
+Both services read their settings when first imported, so they are set here.
+The backend runs against a throwaway SQLite database unless
+TEST_DATABASE_URL names a migrated PostgreSQL database, which the query plan
+check needs. The auth service always gets its own SQLite database.
+
+Run from the backend directory, with tests/requirements.txt installed:
+python -m pytest tests
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import asyncio
+import importlib
+import os
+import sys
+import tempfile
+import fakeredis
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent
+AUTH = BACKEND.parent / "auth"
+# Top-level packages both services define.
+SERVICE_PACKAGES = ("core", "db", "jwt_auth", "main", "metrics", "profiler", "routers")
+
+DATA = Path(tempfile.mkdtemp(prefix="trenmat-tests-"))
+AUTH_LINK = f"sqlite+aiosqlite:///{DATA / 'auth.db'}"
+
+os.environ["LINK"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{DATA / 'backend.db'}"
+)
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.pop("SERVICE_KEY", None)
+sys.path.insert(0, str(BACKEND))
+
+
+def _service_modules() -> list:
+    return [
+        name for name in sys.modules if name.split(".")[0] in SERVICE_PACKAGES
+    ]
+
+
+def import_auth_service() -> SimpleNamespace:
+    """Import the auth service's routes alongside the backend's packages.
+
+    The backend's modules of the same names are set aside while the auth
+    service imports and put back afterwards; the auth modules keep working
+    through the references they already hold.
+    """
+    backend_modules = {name: sys.modules.pop(name) for name in _service_modules()}
+    backend_link = os.environ["LINK"]
+    os.environ["LINK"] = AUTH_LINK
+    sys.path.insert(0, str(AUTH))
+    try:
+        service = SimpleNamespace(
+            db=importlib.import_module("db"),
+            models=importlib.import_module("db.models"),
+            jwt_auth=importlib.import_module("jwt_auth"),
+            routes=importlib.import_module("routers.routes"),
+        )
+    finally:
+        sys.path.remove(str(AUTH))
+        os.environ["LINK"] = backend_link
+        for name in _service_modules():
+            del sys.modules[name]
+        sys.modules.update(backend_modules)
+    return service
+
+
+auth_service = import_auth_service()
+
+
+def access_token(user_id: int, role: str, ip: str = "127.0.0.1") -> str:
+    """A token as the auth service issues it on login."""
+    return auth_service.jwt_auth.create_access_token(
+        {"sub": user_id, "email": f"{role}{user_id}@test.local", "role": role}, ip=ip
+    )
+
+
+async def _create_schemas():
+    import db
+
+    for service_db in (auth_service.db, db):
+        await service_db.init_db()
+        await service_db.engine.dispose()
+
+
+asyncio.run(_create_schemas())
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def dispose_engines(anyio_backend):
+    """Pooled connections belong to the event loop of the test that made them."""
+    import db
+
+    yield
+    await auth_service.db.engine.dispose()
+    await db.engine.dispose()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """An empty fakeredis, with Lua, behind the session store."""
+    from session_store import session_store
+
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(session_store, "client", client)
+    return client
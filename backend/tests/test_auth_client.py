@@ -0,0 +1,142 @@
+"""Roster lookups against the auth service, run in-process."""
+
+from uuid import uuid4
+import httpx
+import pytest
+from fastapi import FastAPI
+from auth_client import AuthClient
+from db import SessionLocal
+from db.models import Class, ClassMembership
+from routers import routes
+from conftest import access_token, auth_service
+
+pytestmark = pytest.mark.anyio
+
+IP = "127.0.0.1"
+
+
+def auth_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_service.routes.router)
+    return app
+
+
+def backend_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(routes.router)
+    return app
+
+
+def asgi_client(app: FastAPI, base_url: str) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=(IP, 123))
+    return httpx.AsyncClient(transport=transport, base_url=base_url)
+
+
+async def add_students(count: int) -> list:
+    async with auth_service.db.SessionLocal() as db:
+        students = [
+            auth_service.models.Student(email=f"{uuid4()}@test.local", password="-")
+            for _ in range(count)
+        ]
+        db.add_all(students)
+        await db.flush()
+        rows = [(student.id, student.email) for student in students]
+        await db.commit()
+        return rows
+
+
+async def add_class(teacher_id: int, student_ids) -> int:
+    async with SessionLocal() as db:
+        cls = Class(teacher_id=teacher_id, cl_name="roster")
+        db.add(cls)
+        await db.flush()
+        class_id = cls.id
+        db.add_all(
+            ClassMembership(class_id=class_id, student_id=student_id)
+            for student_id in student_ids
+        )
+        await db.commit()
+        return class_id
+
+
+@pytest.fixture
+async def client():
+    client = AuthClient(
+        base_url="http://auth",
+        transport=httpx.ASGITransport(app=auth_app()),
+    )
+    yield client
+    await client.close()
+
+
+async def test_roster_resolves_emails(client, monkeypatch):
+    students = await add_students(3)
+    ids = [student_id for student_id, _ in students]
+    unknown = max(ids) + 1000
+    class_id = await add_class(7, ids + [unknown])
+    monkeypatch.setattr(routes, "auth_client", client)
+
+    async with asgi_client(backend_app(), "http://backend") as backend:
+        response = await backend.get(
+            f"/api/classes/{class_id}/students",
+            headers={"token": access_token(7, "teacher")},
+        )
+
+    assert response.status_code == 200
+    roster = [{"id": student_id, "email": email} for student_id, email in students]
+    assert response.json() == {"students": roster + [{"id": unknown, "email": None}]}
+
+
+async def test_cached_profiles_skip_the_lookup(client):
+    students = await add_students(2)
+    ids = [student_id for student_id, _ in students]
+
+    first = await client.get_profiles(ids)
+    second = await client.get_profiles(ids)
+
+    assert first == second
+    emails = {user_id: profile["email"] for user_id, profile in second.items()}
+    assert emails == dict(students)
+    assert client.stats() == {"size": 2, "hits": 2, "misses": 2, "lookups": 1}
+
+
+async def test_unknown_ids_are_left_out_and_cached(client):
+    [(student_id, email)] = await add_students(1)
+    unknown = student_id + 1000
+
+    profiles = await client.get_profiles([student_id, unknown])
+    again = await client.get_profiles([unknown])
+
+    assert list(profiles) == [student_id]
+    assert profiles[student_id]["email"] == email
+    assert again == {}
+    assert client.stats()["lookups"] == 1
+
+
+async def test_lookups_are_batched(client):
+    students = await add_students(5)
+    client.batch_size = 2
+
+    profiles = await client.get_profiles([student_id for student_id, _ in students])
+
+    assert len(profiles) == 5
+    assert client.stats()["lookups"] == 3
+
+
+async def test_auth_service_down_is_a_bad_gateway(monkeypatch):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    down = AuthClient(base_url="http://auth", transport=httpx.MockTransport(refuse))
+    class_id = await add_class(8, [1, 2])
+    monkeypatch.setattr(routes, "auth_client", down)
+
+    async with asgi_client(backend_app(), "http://backend") as backend:
+        response = await backend.get(
+            f"/api/classes/{class_id}/students",
+            headers={"token": access_token(8, "teacher")},
+        )
+    await down.close()
+
+    assert response.status_code == 502
+    assert response.json() == {"detail": "Auth service unavailable"}
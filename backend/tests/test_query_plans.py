@@ -0,0 +1,21 @@
+"""Hot route queries must not plan a sequential scan on seeded data."""
+
+import pytest
+from db import engine
+from scripts.check_query_plans import check
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(
+        engine.dialect.name != "postgresql",
+        reason="set TEST_DATABASE_URL to a migrated PostgreSQL database",
+    ),
+]
+
+
+async def test_hot_queries_use_indexes():
+    failures = await check()
+    assert failures == {}, "; ".join(
+        f"{name}: sequential scan on {', '.join(tables)}"
+        for name, tables in failures.items()
+    )
@@ -0,0 +1,208 @@
+"""Seeded questions and the assignment session scripts."""
+
+from datetime import date, timedelta
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import select
+from db import SessionLocal, models
+from db.models import Class, Result
+from routers import routes
+from session_store import session_store
+from trig_quiz import count_correct, question_at, questions_at
+from conftest import access_token
+
+pytestmark = pytest.mark.anyio
+
+SEED = 1234
+
+
+def session_fields(questions: int = 3, time_limit: int = 30) -> dict:
+    """A started_test hash as POST /start_homework writes it."""
+    return {
+        "questions_left": questions,
+        "question_time_limit": time_limit,
+        "correct_answers": 0,
+        "assignment_id": 1,
+        "student_id": 1,
+        "seed": SEED,
+        "next": 0,
+        "active_since": time.time(),
+    }
+
+
+def wrong_answer(seed, index):
+    _, correct, options = question_at(seed, index)
+    return next(option for option in options if option != correct)
+
+
+def student_client(student_id: int) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(routes.router)
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 123))
+    return httpx.AsyncClient(
+        transport=transport,
+        base_url="http://backend",
+        headers={"token": access_token(student_id, "student")},
+    )
+
+
+async def add_assignment(questions: int, time_limit: int = 30) -> int:
+    async with SessionLocal() as db:
+        cls = Class(teacher_id=9, cl_name="sessions")
+        db.add(cls)
+        await db.flush()
+        test = models.Test(
+            class_id=cls.id,
+            test_name="batch",
+            hand_in_by_date=date.today() + timedelta(days=7),
+            created_date=date.today(),
+            number_of_questions=questions,
+            time_to_answer=time_limit,
+        )
+        db.add(test)
+        await db.flush()
+        test_id = test.id
+        await db.commit()
+        return test_id
+
+
+async def results_of(student_id: int) -> list:
+    async with SessionLocal() as db:
+        outcomes = select(Result.outcome).where(Result.student_id == student_id)
+        return (await db.scalars(outcomes)).all()
+
+
+def test_questions_are_derived_from_seed_and_index():
+    assert question_at(SEED, 4) == question_at(SEED, 4)
+    assert questions_at(SEED, 2, 3) == [question_at(SEED, index) for index in (2, 3, 4)]
+
+    answers = {0: question_at(SEED, 0)[1], 1: wrong_answer(SEED, 1)}
+    answers[5] = question_at(SEED, 5)[1]
+    assert count_correct(SEED, answers) == 2
+    assert count_correct(SEED, {}) == 0
+
+
+async def test_sessions_that_cannot_be_scored(redis):
+    await redis.hset("started_test_1", mapping={"next": 0, "questions_left": 2})
+    await session_store.set_data("started_test_2", {"questions_left": 2})
+
+    for key in ("started_test_0", "started_test_1", "started_test_2"):
+        assert await session_store.serve_questions(key) is None
+        outcome = await session_store.submit_answer(key, "1/2")
+        assert outcome["status"] == "no_session"
+    assert await session_store.get_hash("started_test_2") is None
+
+
+async def test_only_served_questions_can_be_answered(redis):
+    await session_store.set_hash("started_test_3", session_fields())
+
+    outcome = await session_store.submit_answer("started_test_3", "1/2")
+    assert outcome["status"] == "no_question"
+
+    await session_store.serve_questions("started_test_3", 2)
+    outcome = await session_store.submit_answer("started_test_3", "1/2", 2)
+    assert outcome["status"] == "no_question"
+
+    outcome = await session_store.submit_answer("started_test_3", "1/2", 1)
+    assert (outcome["status"], outcome["index"]) == ("ok", 1)
+    assert outcome["questions_left"] == 1
+    outcome = await session_store.submit_answer("started_test_3", "1/2", 0)
+    assert outcome["status"] == "answered"
+    outcome = await session_store.submit_answer("started_test_3", "1/2")
+    assert outcome["status"] == "no_question"
+
+
+async def test_without_question_id_the_current_question_is_answered(redis):
+    await session_store.set_hash("started_test_4", session_fields())
+    await session_store.serve_questions("started_test_4", 3)
+
+    outcome = await session_store.submit_answer("started_test_4", "1/2")
+    assert (outcome["status"], outcome["index"]) == ("ok", 0)
+    assert outcome["questions_left"] == 2
+
+
+async def test_late_answers_are_not_recorded(redis):
+    await session_store.set_hash("started_test_5", session_fields(time_limit=10))
+    await session_store.serve_questions("started_test_5")
+    past = time.time() - 60
+    await redis.hset(
+        "started_test_5", mapping={"served_at_0": past, "active_since": past}
+    )
+
+    outcome = await session_store.submit_answer("started_test_5", "1/2", 0)
+    assert (outcome["status"], outcome["late"]) == ("ok", True)
+    session = await session_store.get_hash("started_test_5")
+    assert "answer_0" not in session
+    assert session["next"] == "1"
+
+
+async def test_last_answer_returns_the_session(redis):
+    await session_store.set_hash("started_test_6", session_fields(questions=2))
+    await session_store.serve_questions("started_test_6", 2)
+    await session_store.submit_answer("started_test_6", "1/2", 0)
+
+    outcome = await session_store.submit_answer("started_test_6", "√3/2", 1)
+    assert outcome["status"] == "done"
+    assert outcome["answers"] == {0: "1/2", 1: "√3/2"}
+    assert outcome["correct_answers"] == 0
+    assert not await redis.exists("started_test_6")
+
+
+async def test_batch_answers_are_saved_as_a_result(redis):
+    test_id = await add_assignment(3)
+    async with student_client(701) as client:
+        response = await client.post(f"/api/start_homework/{test_id}")
+        assert response.status_code == 200
+        batch = (await client.get("/api/questions", params={"count": 3})).json()
+        seed = (await session_store.get_hash("started_test_701"))["seed"]
+
+        answers = [question_at(seed, index)[1] for index in (0, 1)]
+        answers.append(wrong_answer(seed, 2))
+        replies = []
+        for question, answer in zip(batch["questions"], answers):
+            response = await client.post(
+                "/api/submit_answer",
+                json={"answer": answer, "question_id": question["question_id"]},
+            )
+            replies.append(response.json()["is_correct"])
+
+    assert replies == [True, True, False]
+    assert await results_of(701) == [{"correct_answers": 2}]
+
+
+async def test_current_question_after_a_batch(redis):
+    test_id = await add_assignment(3)
+    async with student_client(702) as client:
+        await client.post(f"/api/start_homework/{test_id}")
+        await client.get("/api/questions", params={"count": 3})
+        question = (await client.get("/api/question")).json()
+        assert question["question_id"] == 0
+
+        seed = (await session_store.get_hash("started_test_702"))["seed"]
+        response = await client.post(
+            "/api/submit_answer", json={"answer": question_at(seed, 0)[1]}
+        )
+        assert response.json() == {"is_correct": True}
+
+    session = await session_store.get_hash("started_test_702")
+    assert (session["next"], session["questions_left"]) == ("1", "2")
+    assert await results_of(702) == []
+
+
+async def test_sessions_from_before_seeds_are_not_found(redis):
+    await session_store.set_data(
+        "practice_703", {"correct_answers": 1, "total_questions": 2}
+    )
+    await session_store.set_data("started_test_704", {"questions_left": 2})
+
+    async with student_client(703) as client:
+        assert (await client.get("/api/practice_question")).status_code == 404
+        response = await client.post("/api/submit_practice_answer", json={"answer": 1})
+        assert response.status_code == 404
+        assert (await client.get("/api/questions")).status_code == 404
+    async with student_client(704) as client:
+        assert (await client.get("/api/question")).status_code == 404
+        response = await client.post("/api/submit_answer", json={"answer": 1})
+        assert response.status_code == 404
@@ -0,0 +1,63 @@
+"""Replaying the write-behind spool at startup."""
+
+from datetime import date
+import asyncio
+import json
+import pytest
+from sqlalchemy import func, select
+from db import SessionLocal
+from db.models import Practice, StudentStats
+from db.write_behind import WriteBehind
+
+pytestmark = pytest.mark.anyio
+
+
+def spool_practices(path, student_id: int, count: int):
+    with path.open("w", encoding="utf-8") as spool:
+        for _ in range(count):
+            row = {
+                "student_id": student_id,
+                "time": date.today().isoformat(),
+                "correct": 3,
+                "count": 5,
+            }
+            spool.write(json.dumps({"table": "practices", "row": row}) + "\n")
+
+
+async def practices_of(student_id: int) -> int:
+    async with SessionLocal() as db:
+        return await db.scalar(
+            select(func.count()).where(Practice.student_id == student_id)
+        )
+
+
+async def test_workers_replay_a_shared_spool_once(tmp_path):
+    spool = tmp_path / "spool.jsonl"
+    spool_practices(spool, 501, 2)
+    workers = [WriteBehind(enabled=True, spool_path=spool) for _ in range(3)]
+
+    await asyncio.gather(*(worker._replay_spool() for worker in workers))
+
+    assert await practices_of(501) == 2
+    async with SessionLocal() as db:
+        assert (await db.get(StudentStats, 501)).total_sessions == 2
+    assert sum(worker.rows_flushed for worker in workers) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_failed_replay_keeps_the_spool(tmp_path, monkeypatch):
+    spool = tmp_path / "spool.jsonl"
+    spool_practices(spool, 502, 2)
+    lines = spool.read_text(encoding="utf-8")
+
+    async def fail(items):
+        raise ConnectionError("database unreachable")
+
+    worker = WriteBehind(enabled=True, spool_path=spool)
+    monkeypatch.setattr(worker, "_write", fail)
+    with pytest.raises(ConnectionError):
+        await worker._replay_spool()
+
+    assert list(tmp_path.iterdir()) == [spool]
+    assert spool.read_text(encoding="utf-8") == lines
+    assert await practices_of(502) == 0
@@ -0,0 +1,61 @@
+"""The practice and assignment WebSocket."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from routers import ws
+from session_store import session_store
+from conftest import access_token
+
+
+def session_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(ws.router)
+    return TestClient(app)
+
+
+def start_frame(student_id: int) -> dict:
+    token = access_token(student_id, "student", ip="testclient")
+    return {"type": "start", "token": token, "mode": "practice"}
+
+
+def practice_state(client: TestClient, student_id: int) -> dict:
+    return client.portal.call(session_store.get_data, f"practice_{student_id}")
+
+
+def test_binary_frames_get_an_error_frame(redis):
+    with session_client() as client:
+        with client.websocket_connect("/api/ws/session") as conn:
+            conn.send_json(start_frame(601))
+            question = conn.receive_json()
+
+            conn.send_bytes(b"\x00\x01")
+            error = conn.receive_json()
+            assert error == {"type": "error", "detail": "Malformed frame"}
+
+            conn.send_json({"type": "answer", "answer": question["options"][0]})
+            assert conn.receive_json()["total_questions"] == 1
+
+        assert practice_state(client, 601)["total_questions"] == 1
+
+
+def test_unexpected_errors_still_checkpoint(redis, monkeypatch):
+    score = ws.QuizSession.score
+
+    def score_once(session, answer, late=False):
+        if session.total_questions:
+            raise RuntimeError("scoring failed")
+        return score(session, answer, late)
+
+    monkeypatch.setattr(ws.QuizSession, "score", score_once)
+    with session_client() as client:
+        socket = client.websocket_connect("/api/ws/session")
+        with pytest.raises(RuntimeError), socket as conn:
+            conn.send_json(start_frame(602))
+            question = conn.receive_json()
+            conn.send_json({"type": "answer", "answer": question["options"][0]})
+            conn.receive_json()
+            conn.send_json({"type": "answer", "answer": question["options"][0]})
+            conn.receive_json()
+
+        assert practice_state(client, 602)["total_questions"] == 1
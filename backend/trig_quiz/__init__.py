@@ -1 +1,8 @@
-from .question_generator import generate_question
+from .question_generator import (
+    count_correct,
+    generate_question,
+    generate_questions,
+    new_seed,
+    question_at,
+    questions_at,
+)
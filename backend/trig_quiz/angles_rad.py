@@ -0,0 +1,11 @@
+"""Radian forms of the angles in trig_values.angles, as sympy prints them.
+
+Generated by scripts/generate_angles_rad.py, do not edit by hand.
+"""
+
+angles_rad = {
+    1: ["0", "pi/6", "pi/4", "pi/3", "pi/2"],
+    2: ["2*pi/3", "3*pi/4", "5*pi/6", "pi"],
+    3: ["7*pi/6", "5*pi/4", "4*pi/3", "3*pi/2"],
+    4: ["5*pi/3", "7*pi/4", "11*pi/6", "2*pi"],
+}
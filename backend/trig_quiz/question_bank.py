@@ -0,0 +1,38 @@
+from typing import NamedTuple, Tuple
+from .trig_values import angles, angles_rad
+from .utils import get_value_with_sign
+
+FUNCTIONS = ("sin", "cos", "tg", "ctg")
+
+
+class BankEntry(NamedTuple):
+    question: str
+    answer: str | int
+    distractors: Tuple[str | int, ...]
+
+
+def _distinct_values(function):
+    values = []
+    for quadrant, quadrant_angles in angles.items():
+        for angle_deg in quadrant_angles:
+            value = get_value_with_sign(function, angle_deg, quadrant)
+            if value not in values:
+                values.append(value)
+    return values
+
+
+def _build_bank():
+    bank = []
+    for function in FUNCTIONS:
+        values = _distinct_values(function)
+        for quadrant, quadrant_angles in angles.items():
+            for angle_deg, angle_rad in zip(quadrant_angles, angles_rad[quadrant]):
+                answer = get_value_with_sign(function, angle_deg, quadrant)
+                distractors = tuple(value for value in values if value != answer)
+                for angle in (f"{angle_deg}°", f"{angle_rad}"):
+                    bank.append(BankEntry(f"{function}({angle})", answer, distractors))
+    return tuple(bank)
+
+
+# Every (function, angle, unit) combination, enumerated once at import.
+QUESTION_BANK = _build_bank()
@@ -1,29 +1,43 @@
 import random
-from .trig_values import angles, angles_rad
-from .utils import get_value_with_sign
+import secrets
+from .question_bank import QUESTION_BANK
+
+
+def _draw(rng):
+    entry = rng.choice(QUESTION_BANK)
+    all_answers = rng.sample(entry.distractors, 3) + [entry.answer]
+    rng.shuffle(all_answers)
+    return entry.question, entry.answer, all_answers
 
 
 def generate_question():
-    function = random.choice(["sin", "cos", "tg", "ctg"])
-    quadrant = random.choice([1, 2, 3, 4])
-    angle_deg = random.choice(angles[quadrant])
-    answer = get_value_with_sign(function, angle_deg, quadrant)
-
-    wrong_answers = set()
-    while len(wrong_answers) < 3:
-        random_quadrant = random.choice([1, 2, 3, 4])
-        wrong_answer = get_value_with_sign(
-            function, random.choice(angles[random_quadrant]), random_quadrant
-        )
-        if wrong_answer != answer:
-            wrong_answers.add(wrong_answer)
-
-    all_answers = list(wrong_answers) + [answer]
-    random.shuffle(all_answers)
-
-    angle_rad = angles_rad[quadrant][angles[quadrant].index(angle_deg)]
-    unit = random.choice(["градусов", "радиан"])
-    angle = f"{angle_deg}°" if unit == "градусов" else f"{angle_rad}"
-    question = f"{function}({angle})"
-
-    return question, answer, all_answers
+    return _draw(random)
+
+
+def generate_questions(n, rng=None):
+    rng = rng or random
+    return [_draw(rng) for _ in range(n)]
+
+
+def new_seed():
+    return secrets.randbits(63)
+
+
+def question_at(seed, index):
+    """The question at ``index`` of the stream started by ``seed``.
+
+    Every question gets its own generator, so any index can be derived
+    without the ones before it, on any process.
+    """
+    return _draw(random.Random(f"{seed}:{index}"))
+
+
+def questions_at(seed, start, count):
+    return [question_at(seed, index) for index in range(start, start + count)]
+
+
+def count_correct(seed, answers):
+    """Replay recorded answers, a dict of index to answer, against the stream."""
+    return sum(
+        answer == question_at(seed, index)[1] for index, answer in answers.items()
+    )
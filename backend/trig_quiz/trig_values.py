@@ -1,4 +1,4 @@
-import sympy as sp
+from .angles_rad import angles_rad
 
 trig_values_quadrant1 = {
     "sin": {0: 0, 30: "1/2", 45: "sqrt(2)/2", 60: "sqrt(3)/2", 90: 1},
@@ -13,10 +13,3 @@ angles = {
     3: [210, 225, 240, 270],
     4: [300, 315, 330, 360],
 }
-
-angles_rad = {
-    1: [0, sp.pi / 6, sp.pi / 4, sp.pi / 3, sp.pi / 2],
-    2: [2 * sp.pi / 3, 3 * sp.pi / 4, 5 * sp.pi / 6, sp.pi],
-    3: [7 * sp.pi / 6, 5 * sp.pi / 4, 4 * sp.pi / 3, 3 * sp.pi / 2],
-    4: [5 * sp.pi / 3, 7 * sp.pi / 4, 11 * sp.pi / 6, 2 * sp.pi],
-}
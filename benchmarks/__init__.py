@@ -0,0 +1,17 @@
+"""Benchmarks for the backend and auth services.
+
+Run them from the repository root, e.g. ``python -m benchmarks.trig_import``.
+"""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def use_service(name: str) -> Path:
+    """Put a service directory on sys.path so its top-level packages import."""
+    path = ROOT / name
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+    return path
@@ -0,0 +1,420 @@
+"""Per-route latency of both services under replayed user scenarios.
+
+Requests go through httpx.ASGITransport, so the numbers cover the apps
+themselves, without a network or an HTTP server. Each service runs in its
+own subprocess, because both import top-level ``core`` and ``db`` packages.
+Each uses a throwaway SQLite database unless AUTH_LINK or BACKEND_LINK is
+set. The backend uses fakeredis unless REDIS_HOST is set.
+
+Scenarios:
+- auth: a login storm, and paging through the user list.
+- backend: a class of --students students running an assignment end to end,
+  first one question at a time and then with prefetched batches. Also
+  practice loops, and a teacher refreshing the dashboard.
+
+The JSON report has throughput and p50/p95/p99 per route, so two commits can
+be compared:
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.asgi_load --students 30 --output bench.json
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import quantiles
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import ROOT, use_service
+
+SECRET_KEY = "benchmark-secret-key-benchmark-secret"
+
+
+class Recorder:
+    """Times every request of a scenario under its route template."""
+
+    def __init__(self, client):
+        self.client = client
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    async def call(self, method: str, route: str, url: str = None, **kwargs):
+        started = time.perf_counter()
+        response = await self.client.request(method, url or route, **kwargs)
+        self.samples[f"{method} {route}"].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[f"{method} {route}"] += 1
+        return response
+
+
+def summarise(recorder: Recorder, seconds: float) -> dict:
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        cuts = quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        routes[route] = {
+            "requests": len(samples),
+            "errors": recorder.errors[route],
+            "throughput_rps": round(len(samples) / seconds, 1),
+            "p50_ms": round(cuts[49] * 1000, 2),
+            "p95_ms": round(cuts[94] * 1000, 2),
+            "p99_ms": round(cuts[98] * 1000, 2),
+        }
+    total = sum(len(samples) for samples in recorder.samples.values())
+    return {
+        "seconds": round(seconds, 3),
+        "requests": total,
+        "throughput_rps": round(total / seconds, 1),
+        "routes": routes,
+    }
+
+
+async def run_scenarios(app, scenarios, args) -> dict:
+    import httpx
+
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        state = {}
+        for name, scenario in scenarios:
+            recorder = Recorder(client)
+            started = time.perf_counter()
+            await scenario(recorder, state, args)
+            report[name] = summarise(recorder, time.perf_counter() - started)
+    return report
+
+
+# auth
+
+
+async def auth_register(rec, state, args):
+    state["users"] = [f"student{i}@bench.local" for i in range(args.logins)]
+    await asyncio.gather(
+        *(
+            rec.call(
+                "POST",
+                "/auth/register",
+                json={"email": email, "password": "pw", "role": "student"},
+            )
+            for email in state["users"]
+        )
+    )
+
+
+async def auth_login_storm(rec, state, args):
+    await asyncio.gather(
+        *(
+            rec.call(
+                "POST",
+                "/auth/login",
+                json={"email": email, "password": "pw", "role": "student"},
+            )
+            for email in state["users"]
+        )
+    )
+
+
+async def auth_user_listing(rec, state, args):
+    cursor = None
+    while True:
+        params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+        response = await rec.call("GET", "/auth/users", params=params)
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    await rec.call(
+        "POST",
+        "/auth/users/lookup",
+        json={"ids": list(range(1, min(args.logins, 200) + 1))},
+    )
+
+
+async def run_auth(args) -> dict:
+    use_service("auth")
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        return await run_scenarios(
+            main.app,
+            [
+                ("register", auth_register),
+                ("login_storm", auth_login_storm),
+                ("user_listing", auth_user_listing),
+            ],
+            args,
+        )
+
+
+# backend
+
+
+def make_token(user_id: int, role: str) -> dict:
+    import jwt
+
+    payload = {
+        "sub": user_id,
+        "email": f"{role}{user_id}@bench.local",
+        "role": role,
+        # httpx.ASGITransport reports this client address.
+        "ip": "127.0.0.1",
+        "exp": datetime.now() + timedelta(hours=1),
+    }
+    return {"token": jwt.encode(payload, SECRET_KEY, algorithm="HS256")}
+
+
+def new_assignment(class_id: int, name: str, questions: int) -> dict:
+    return {
+        "class_id": class_id,
+        "test_name": name,
+        "hand_in_by_date": (datetime.now() + timedelta(days=7)).isoformat(),
+        "created_date": datetime.now().isoformat(),
+        "multiple_attempts": True,
+        "number_of_questions": questions,
+        "time_to_answer": 60,
+    }
+
+
+async def backend_class_setup(rec, state, args):
+    teacher = state["teacher"] = make_token(1, "teacher")
+    state["students"] = [
+        make_token(1000 + i, "student") for i in range(args.students)
+    ]
+    await rec.call("POST", "/api/class", json={"name": "bench"}, headers=teacher)
+    classes = (await rec.call("GET", "/api/classes", headers=teacher)).json()
+    class_id = state["class_id"] = classes["classes"][-1]["id"]
+    code = (
+        await rec.call(
+            "GET",
+            "/api/classes/{class_id}/join-link",
+            f"/api/classes/{class_id}/join-link",
+            headers=teacher,
+        )
+    ).json()["join_link"]
+    await asyncio.gather(
+        *(
+            rec.call(
+                "GET", "/api/join/class/{code}", f"/api/join/class/{code}", headers=h
+            )
+            for h in state["students"]
+        )
+    )
+    for name in ("single", "batch"):
+        await rec.call(
+            "POST",
+            "/api/assignment",
+            json=new_assignment(class_id, name, args.questions),
+            headers=teacher,
+        )
+    await rec.call(
+        "GET",
+        "/api/assignments/{class_id}",
+        f"/api/assignments/{class_id}",
+        headers=teacher,
+    )
+    # The teacher's listing has no ids; the students' one does.
+    homeworks = (
+        await rec.call("GET", "/api/homeworks", headers=state["students"][0])
+    ).json()["homeworks"]
+    state["assignments"] = {hw["test_name"]: hw["id"] for hw in homeworks}
+
+
+async def backend_assignment(rec, state, args):
+    assignment_id = state["assignments"]["single"]
+
+    async def student(headers):
+        await rec.call(
+            "POST",
+            "/api/start_homework/{assignment_id}",
+            f"/api/start_homework/{assignment_id}",
+            headers=headers,
+        )
+        for _ in range(args.questions):
+            question = (await rec.call("GET", "/api/question", headers=headers)).json()
+            await rec.call(
+                "POST",
+                "/api/submit_answer",
+                json={"answer": question["options"][0]},
+                headers=headers,
+            )
+
+    await asyncio.gather(*(student(headers) for headers in state["students"]))
+
+
+async def backend_assignment_batch(rec, state, args):
+    assignment_id = state["assignments"]["batch"]
+
+    async def student(headers):
+        await rec.call(
+            "POST",
+            "/api/start_homework/{assignment_id}",
+            f"/api/start_homework/{assignment_id}",
+            headers=headers,
+        )
+        batch = (
+            await rec.call(
+                "GET",
+                "/api/questions",
+                params={"count": args.questions},
+                headers=headers,
+            )
+        ).json()
+        for question in batch["questions"]:
+            await rec.call(
+                "POST",
+                "/api/submit_answer",
+                json={
+                    "answer": question["options"][0],
+                    "question_id": question["question_id"],
+                },
+                headers=headers,
+            )
+
+    await asyncio.gather(*(student(headers) for headers in state["students"]))
+
+
+async def backend_practice(rec, state, args):
+    async def student(headers):
+        await rec.call("POST", "/api/start_practice", headers=headers)
+        for _ in range(args.practice_rounds):
+            question = (
+                await rec.call("GET", "/api/practice_question", headers=headers)
+            ).json()
+            await rec.call(
+                "POST",
+                "/api/submit_practice_answer",
+                json={"answer": question["options"][0]},
+                headers=headers,
+            )
+        await rec.call("POST", "/api/end_practice", headers=headers)
+        await rec.call("GET", "/api/statistics", headers=headers)
+
+    await asyncio.gather(*(student(headers) for headers in state["students"]))
+
+
+async def backend_dashboard(rec, state, args):
+    teacher, class_id = state["teacher"], state["class_id"]
+    routes = [
+        "/api/classes",
+        "/api/assignments/{class_id}",
+        "/api/classes/{class_id}/join-link",
+        "/api/classes/{class_id}/gradebook",
+    ]
+    for _ in range(args.refreshes):
+        await asyncio.gather(
+            *(
+                rec.call("GET", route, route.format(class_id=class_id), headers=teacher)
+                for route in routes
+            )
+        )
+
+
+async def run_backend(args) -> dict:
+    use_service("backend")
+    import main
+    from session_store import session_store
+
+    if not os.environ.get("REDIS_HOST"):
+        import fakeredis
+
+        session_store.client = fakeredis.FakeAsyncRedis()
+
+    async with main.app.router.lifespan_context(main.app):
+        return await run_scenarios(
+            main.app,
+            [
+                ("class_setup", backend_class_setup),
+                ("assignment", backend_assignment),
+                ("assignment_batch", backend_assignment_batch),
+                ("practice", backend_practice),
+                ("dashboard", backend_dashboard),
+            ],
+            args,
+        )
+
+
+SERVICES = {"auth": run_auth, "backend": run_backend}
+
+
+def run_service(name: str, argv: list, workdir: Path) -> dict:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", SECRET_KEY)
+    env["LINK"] = os.environ.get(
+        f"{name.upper()}_LINK", f"sqlite+aiosqlite:///{workdir / name}.db"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.asgi_load", "--service", name, *argv],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"{name} benchmark failed")
+    return json.loads(completed.stdout)
+
+
+def git_commit() -> str:
+    completed = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--practice-rounds", type=int, default=10)
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument(
+        "--services", nargs="+", choices=SERVICES, default=list(SERVICES)
+    )
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--service", choices=SERVICES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.service:
+        print(json.dumps(asyncio.run(SERVICES[args.service](args))))
+        return
+
+    parameters = {
+        "students": args.students,
+        "questions": args.questions,
+        "practice_rounds": args.practice_rounds,
+        "refreshes": args.refreshes,
+        "logins": args.logins,
+    }
+    argv = []
+    for name, value in parameters.items():
+        argv += [f"--{name.replace('_', '-')}", str(value)]
+    with tempfile.TemporaryDirectory() as workdir:
+        report = {
+            "commit": git_commit(),
+            "parameters": parameters,
+            "services": {
+                name: run_service(name, argv, Path(workdir)) for name in args.services
+            },
+        }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""How database pool size affects tail latency under concurrent load.
+
+For each pool size, ``--concurrency`` workers run ``--requests`` queries
+each. A query checks a connection out, runs ``SELECT 1`` and keeps the
+connection for ``--hold-ms`` to stand in for real query time. Latency
+includes the wait for a free connection, which is what grows once the
+pool saturates.
+
+    LINK=postgresql+asyncpg://... python -m benchmarks.pool_sizing --sizes 2 5 10 20
+"""
+
+from statistics import quantiles
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks import use_service
+
+os.environ.setdefault("LINK", "sqlite+aiosqlite:///pool_sizing.db")
+use_service("backend")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from db.pool import InstrumentedPool  # noqa: E402
+
+
+async def run(pool_size: int, args) -> dict:
+    engine = create_async_engine(
+        os.environ["LINK"],
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=args.timeout,
+    )
+    latencies = []
+
+    async def worker():
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(args.hold_ms / 1000)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    snapshot = engine.pool.snapshot()
+    await engine.dispose()
+
+    cuts = quantiles(latencies, n=100)
+    return {
+        "pool_size": pool_size,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "pool": snapshot,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    report = [await run(size, args) for size in args.sizes]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
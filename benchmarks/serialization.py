@@ -0,0 +1,267 @@
+"""Cost of turning query results into response bytes, per backend route.
+
+"before" replays what the routes did before the fast response path: ORM
+objects or pydantic models, the response_model validation and serialisation
+FastAPI runs on the return value, then JSONResponse. "after" is the current
+path: dicts from the ``routers.dto`` helpers rendered by ORJSONResponse.
+Rows come from an in-memory SQLite database and are fetched before timing,
+so only serialisation is measured.
+
+    python -m benchmarks.serialization --rows 50 --students 30
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+import argparse
+import json
+import os
+import timeit
+
+from benchmarks import use_service
+
+os.environ.setdefault("LINK", "sqlite+aiosqlite:///serialization.db")
+use_service("backend")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from db.models import Base, Class, ClassMembership, Practice, Test  # noqa: E402
+from routers import dto  # noqa: E402
+from routers.pydantic_models import (  # noqa: E402
+    AssignmentOut,
+    ClassOut,
+    GradebookResponse,
+    SessionHistoryItem,
+    StatisticsResponse,
+)
+
+
+def response_model(annotation):
+    """What FastAPI does with a route's return value and response_model."""
+    adapter = TypeAdapter(annotation)
+
+    def serialize(value) -> bytes:
+        value = adapter.validate_python(value, from_attributes=True)
+        return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+    return serialize
+
+
+def seed(session: Session, args):
+    today = date.today()
+    classes = [Class(teacher_id=1, cl_name=f"class {i}") for i in range(args.rows)]
+    session.add_all(classes)
+    session.flush()
+    session.add_all(
+        ClassMembership(class_id=cls.id, student_id=1000 + student)
+        for cls in classes
+        for student in range(args.students)
+    )
+    session.add_all(
+        Test(
+            class_id=classes[0].id,
+            test_name=f"assignment {i}",
+            hand_in_by_date=today + timedelta(days=i),
+            created_date=today,
+            multiple_attempts=True,
+            number_of_questions=10,
+            time_to_answer=30,
+            completed_by=0,
+        )
+        for i in range(args.rows)
+    )
+    session.add_all(
+        Practice(student_id=1000, time=today, correct=7, count=10) for _ in range(3)
+    )
+    session.commit()
+
+
+def gradebook(args) -> dict:
+    """A class_gradebook() result for --rows assignments and --students."""
+    return {
+        "class_id": 1,
+        "enrolled": args.students,
+        "assignments": [
+            {
+                "assignment_id": test,
+                "test_name": f"assignment {test}",
+                "number_of_questions": 10,
+                "students": [
+                    {
+                        "student_id": 1000 + student,
+                        "best_score": 8,
+                        "latest_score": 7,
+                        "attempts": 2,
+                        "last_attempt_time": date.today(),
+                    }
+                    for student in range(args.students)
+                ],
+                "completed": args.students,
+                "completion_rate": 1.0,
+            }
+            for test in range(args.rows)
+        ],
+    }
+
+
+def cases(session: Session, args) -> dict:
+    """Per route, a (before, after) pair of zero-argument callables."""
+    tests = session.scalars(select(Test)).all()
+    homework_rows = session.execute(select(*dto.HOMEWORK_COLUMNS)).all()
+    assignment_rows = session.execute(select(*dto.ASSIGNMENT_COLUMNS)).all()
+    class_rows = session.execute(
+        select(Class, ClassMembership.student_id)
+        .join(ClassMembership, ClassMembership.class_id == Class.id)
+        .order_by(Class.id)
+    ).all()
+    class_columns = session.execute(
+        select(Class.id, Class.teacher_id, Class.cl_name, ClassMembership.student_id)
+        .join(ClassMembership, ClassMembership.class_id == Class.id)
+        .order_by(Class.id)
+    ).all()
+    practices = session.scalars(select(Practice)).all()
+    practice_rows = session.execute(
+        select(Practice.time, Practice.correct, Practice.count)
+    ).all()
+    book = gradebook(args)
+
+    assignments_model = response_model(Dict[str, List[AssignmentOut]])
+    classes_model = response_model(Dict[str, List[ClassOut]])
+    statistics_model = response_model(StatisticsResponse)
+    gradebook_model = response_model(GradebookResponse)
+
+    def homeworks_before():
+        body = {"homeworks": [test.__dict__ for test in tests]}
+        return JSONResponse(jsonable_encoder(body)).body
+
+    def homeworks_after():
+        body = {"homeworks": [dto.homework(row) for row in homework_rows]}
+        return ORJSONResponse(body).body
+
+    def assignments_before():
+        return assignments_model(
+            {
+                "assignments": [
+                    AssignmentOut.model_validate(test, from_attributes=True).model_dump(
+                        mode="json"
+                    )
+                    for test in tests
+                ]
+            }
+        )
+
+    def assignments_after():
+        body = {"assignments": [dto.assignment(row) for row in assignment_rows]}
+        return ORJSONResponse(body).body
+
+    def classes_before():
+        class_out = {}
+        for cls, student_id in class_rows:
+            if cls.id not in class_out:
+                class_out[cls.id] = ClassOut(
+                    id=cls.id,
+                    teacher_id=cls.teacher_id,
+                    cl_name=cls.cl_name,
+                    students=[],
+                    assignments=[],
+                )
+            class_out[cls.id].students.append(student_id)
+        return classes_model({"classes": jsonable_encoder(list(class_out.values()))})
+
+    def classes_after():
+        class_out = {}
+        for row in class_columns:
+            if row.id not in class_out:
+                class_out[row.id] = dto.class_summary(row)
+            class_out[row.id]["students"].append(row.student_id)
+        return ORJSONResponse({"classes": list(class_out.values())}).body
+
+    def statistics_before():
+        return statistics_model(
+            StatisticsResponse(
+                email="student@bench.local",
+                role="student",
+                practice_accuracy=70.0,
+                total_sessions=3,
+                correct_answers=21,
+                recent_activity=date.today(),
+                session_history=[
+                    SessionHistoryItem(
+                        date=p.time,
+                        correct=p.correct,
+                        count=p.count,
+                        accuracy=(p.correct / p.count * 100) if p.count > 0 else 0,
+                    )
+                    for p in practices
+                ],
+                learning_streak=1,
+            )
+        )
+
+    def statistics_after():
+        return ORJSONResponse(
+            {
+                "email": "student@bench.local",
+                "role": "student",
+                "practice_accuracy": 70.0,
+                "total_sessions": 3,
+                "correct_answers": 21,
+                "recent_activity": dto.midnight(date.today()),
+                "session_history": [
+                    dto.session_history_item(row) for row in practice_rows
+                ],
+                "learning_streak": 1,
+            }
+        ).body
+
+    def gradebook_before():
+        return gradebook_model(jsonable_encoder(book))
+
+    def gradebook_after():
+        return ORJSONResponse(book).body
+
+    return {
+        "GET /api/homeworks": (homeworks_before, homeworks_after),
+        "GET /api/assignments/{class_id}": (assignments_before, assignments_after),
+        "GET /api/classes": (classes_before, classes_after),
+        "GET /api/statistics": (statistics_before, statistics_after),
+        "GET /api/classes/{class_id}/gradebook": (gradebook_before, gradebook_after),
+    }
+
+
+def per_call_us(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args)
+        report = {}
+        for route, (before, after) in cases(session, args).items():
+            before_us = per_call_us(before, args.number, args.repeat)
+            after_us = per_call_us(after, args.number, args.repeat)
+            report[route] = {
+                "before_us": round(before_us, 1),
+                "after_us": round(after_us, 1),
+                "speedup": round(before_us / after_us, 2),
+                "bytes": len(after()),
+            }
+    report = {"rows": args.rows, "students": args.students, "routes": report}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
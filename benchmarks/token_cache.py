@@ -0,0 +1,67 @@
+"""Throughput of backend verify_token with and without the claims cache.
+
+Both runs verify the same token over and over, the way one client does during
+a quiz, so the cached run measures the hit path.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks import use_service
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret")
+use_service("backend")
+
+import jwt  # noqa: E402
+import jwt_auth  # noqa: E402
+
+
+def make_token(ip: str) -> str:
+    payload = {
+        "sub": 1,
+        "email": "student@example.com",
+        "role": "student",
+        "ip": ip,
+        "exp": datetime.now() + timedelta(hours=1),
+    }
+    return jwt.encode(payload, str(jwt_auth.SECRET_KEY), algorithm=jwt_auth.ALGORITHM)
+
+
+async def run(cache, iterations: int) -> dict:
+    jwt_auth.token_cache = cache
+    request = SimpleNamespace(client=SimpleNamespace(host="127.0.0.1"))
+    token = make_token(request.client.host)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await jwt_auth.verify_token(request, token)
+    elapsed = time.perf_counter() - start
+    result = {
+        "verifications_per_s": round(iterations / elapsed),
+        "us_per_verification": round(elapsed / iterations * 1e6, 2),
+    }
+    if cache is not None:
+        result.update(cache.stats())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args()
+    report = {
+        "uncached": asyncio.run(run(None, args.iterations)),
+        "cached": asyncio.run(
+            run(jwt_auth.TokenCache(args.cache_size), args.iterations)
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
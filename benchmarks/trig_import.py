@@ -0,0 +1,61 @@
+"""Startup time and peak RSS of importing trig_quiz, with and without sympy.
+
+Each case runs in a fresh interpreter so the numbers include the whole import
+chain, the way a new backend worker pays it on start or autoscale.
+"""
+
+from statistics import median
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks import ROOT
+
+PROBE = """
+import resource, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss_kb, "sympy" in sys.modules)
+"""
+
+CASES = {
+    "interpreter": "pass",
+    "trig_quiz": "import trig_quiz",
+    # What every worker paid while trig_values built angles_rad with sympy.
+    "trig_quiz+sympy": "import sympy\nimport trig_quiz",
+}
+
+
+def measure(imports: str, runs: int) -> dict:
+    times, rss = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(imports=imports)],
+            cwd=ROOT / "backend",
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        rss.append(int(out[1]))
+        sympy_loaded = out[2] == "True"
+    return {
+        "import_ms": round(median(times) * 1000, 2),
+        "max_rss_mb": round(median(rss) / 1024, 2),
+        "sympy_loaded": sympy_loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    report = {name: measure(imports, args.runs) for name, imports in CASES.items()}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
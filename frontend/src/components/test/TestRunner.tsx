@@ -4,6 +4,7 @@ import { Clock, CheckCircle, XCircle } from "lucide-react";
 import apiClient from "../../apiClient";
 
 interface TestQuestion {
+  questionId: number;
   question: string;
   options: string[];
 }
@@ -61,6 +62,7 @@ export function TestRunner({
 
       if (response.data) {
         setCurrentQuestion({
+          questionId: response.data.question_id,
           question: response.data.question,
           options: response.data.options,
         });
@@ -114,7 +116,7 @@ export function TestRunner({
       if (mode === "assignment") {
         response = await apiClient.post(
           "/submit_answer",
-          { answer },
+          { answer, question_id: currentQuestion.questionId },
           {
             headers: { token },
           }
@@ -122,7 +124,7 @@ export function TestRunner({
       } else {
         response = await apiClient.post(
           "/submit_practice_answer",
-          { answer },
+          { answer, question_id: currentQuestion.questionId },
           {
             headers: { token },
           }